@@ -1,23 +1,50 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+import asyncio
 import logging
+import time
 
 from datetime import datetime, timedelta
+from functools import partial
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 
 from .const import (
+    ATTR_END_DATE,
+    ATTR_EXCLUDE_ALLERGENS,
+    ATTR_MAX_PARALLEL,
+    ATTR_MEAL_TYPES,
+    ATTR_START_DATE,
+    CONF_DAYS_AHEAD,
+    DEFAULT_DAYS_AHEAD,
+    DEFAULT_REFRESH_MAX_PARALLEL,
     DOMAIN,
+    MAX_MENU_RANGE_DAYS,
+    MAX_REFRESH_PARALLEL,
+    CONF_HORIZON_WEEKS,
     CONF_UPDATE_INTERVAL_HOURS,
+    DEFAULT_HORIZON_WEEKS,
     DEFAULT_UPDATE_INTERVAL_HOURS,
+    DATA_MUNICIPALITIES,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from .api import async_close_api_client
+from .archive import async_close_menu_archive
+from .coordinator import (
+    MateoMealsCoordinator,
+    MateoConfig,
+    _data_today,
+    async_get_municipality_coordinator,
+    snapshot_storage_key,
 )
-from .coordinator import MateoMealsCoordinator, MateoConfig
 
 if TYPE_CHECKING:  # pragma: no cover
     from .coordinator import MateoMealsCoordinator
@@ -28,21 +55,145 @@ COORDINATORS: dict[str, MateoMealsCoordinator] = {}
 PLATFORMS: list[str] = ["sensor", "calendar"]
 
 
-async def _handle_refresh_service(hass: HomeAssistant, call: ServiceCall) -> None:
+async def _async_refresh_group(
+    group: list[tuple[str, MateoMealsCoordinator]], semaphore: asyncio.Semaphore
+) -> dict[str, dict[str, Any]]:
+    """Refresh one (slug, school_id) once and share the outcome with duplicate entries."""
+    (lead_id, lead), *duplicates = group
+    async with semaphore:
+        started = time.monotonic()
+        # A manual refresh asks the server again even for weeks known to be missing.
+        lead.municipality.async_forget_missing_weeks(lead.school_id)
+        await lead.async_refresh()
+        duration_ms = round((time.monotonic() - started) * 1000)
+    success = lead.last_update_success
+    if success:
+        for _, coord in duplicates:
+            coord.async_set_updated_data(lead.data)
+    result = {
+        "slug": lead.municipality.slug,
+        "school_id": lead.school_id,
+        "success": success,
+        "duration_ms": duration_ms,
+        "error": None if success else str(lead.last_exception),
+    }
+    return {
+        entry_id: {**result, "deduplicated": entry_id != lead_id}
+        for entry_id, _ in group
+    }
+
+
+async def _handle_refresh_service(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
     entry_id = call.data.get("entry_id")
     if entry_id:
-        coord = COORDINATORS.get(entry_id)
-        if coord:
-            await coord.async_request_refresh()
-        return
-    for coord in list(COORDINATORS.values()):
-        await coord.async_request_refresh()
+        targets = [(entry_id, COORDINATORS[entry_id])] if entry_id in COORDINATORS else []
+    else:
+        targets = list(COORDINATORS.items())
+    # Entries for the same school are refreshed once; schools run concurrently up to max_parallel.
+    groups: dict[tuple[str, int], list[tuple[str, MateoMealsCoordinator]]] = {}
+    for target in targets:
+        coord = target[1]
+        groups.setdefault((coord.municipality.slug, coord.school_id), []).append(target)
+    semaphore = asyncio.Semaphore(call.data.get(ATTR_MAX_PARALLEL, DEFAULT_REFRESH_MAX_PARALLEL))
+    started = time.monotonic()
+    summaries = await asyncio.gather(
+        *(_async_refresh_group(group, semaphore) for group in groups.values())
+    )
+    if not call.return_response:
+        return None
+    entries: dict[str, Any] = {}
+    for summary in summaries:
+        entries.update(summary)
+    return {
+        "duration_ms": round((time.monotonic() - started) * 1000),
+        "refreshed": len(groups),
+        "entries": entries,
+    }
+
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): cv.string,
+        vol.Optional(ATTR_MAX_PARALLEL, default=DEFAULT_REFRESH_MAX_PARALLEL): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_REFRESH_PARALLEL)
+        ),
+    }
+)
+
+
+def _meal_matches(meal: dict[str, Any], types: list[str], allergens: list[str]) -> bool:
+    if types:
+        meal_type = (meal.get("type") or "").casefold()
+        if not any(term in meal_type for term in types):
+            return False
+    if allergens:
+        contained = meal.get("allergens")
+        if contained is None:
+            # Allergens unknown (archived by name only); never claim the meal is free of them.
+            return False
+        folded = [allergen.casefold() for allergen in contained]
+        return not any(term in allergen for term in allergens for allergen in folded)
+    return True
+
+
+async def _handle_get_menu_service(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Return one entry's meals for a date range, optionally filtered by type and allergens."""
+    entry_id = call.data["entry_id"]
+    coord = COORDINATORS.get(entry_id)
+    if coord is None:
+        raise ServiceValidationError(f"Mateo Meals entry {entry_id} is not loaded")
+    start = call.data.get(ATTR_START_DATE) or _data_today(coord.data)
+    end = call.data.get(ATTR_END_DATE) or start + timedelta(days=DEFAULT_DAYS_AHEAD - 1)
+    if end < start:
+        raise ServiceValidationError("end_date must not be before start_date")
+    if (end - start).days >= MAX_MENU_RANGE_DAYS:
+        raise ServiceValidationError(f"The date range is limited to {MAX_MENU_RANGE_DAYS} days")
+    types = [term.casefold() for term in call.data.get(ATTR_MEAL_TYPES, [])]
+    allergens = [term.casefold() for term in call.data.get(ATTR_EXCLUDE_ALLERGENS, [])]
+    days: list[dict[str, Any]] = []
+    for key, day_meals in (await coord.async_menu_range(start, end)).items():
+        meals = [meal for meal in day_meals if _meal_matches(meal, types, allergens)]
+        if meals:
+            days.append({"date": key, "meals": meals})
+    return {
+        "slug": coord.municipality.slug,
+        "school_id": coord.school_id,
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "days": days,
+    }
+
+
+GET_MENU_SCHEMA = vol.Schema(
+    {
+        vol.Required("entry_id"): cv.string,
+        vol.Optional(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+        vol.Optional(ATTR_MEAL_TYPES, default=[]): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_EXCLUDE_ALLERGENS, default=[]): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: D401
     services = hass.services.async_services().get(DOMAIN, {})  # type: ignore[attr-defined]
     if "refresh" not in services:
-        hass.services.async_register(DOMAIN, "refresh", _handle_refresh_service)
+        hass.services.async_register(
+            DOMAIN,
+            "refresh",
+            partial(_handle_refresh_service, hass),
+            schema=REFRESH_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+    if "get_menu" not in services:
+        # Stays registered when entries unload; unknown entries are rejected per call.
+        hass.services.async_register(
+            DOMAIN,
+            "get_menu",
+            partial(_handle_get_menu_service, hass),
+            schema=GET_MENU_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
     return True
 
 
@@ -63,11 +214,33 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:  #
         municipality_name=data.get("municipality_name", data["slug"]),
     )
     update_hours = int(entry.options.get(CONF_UPDATE_INTERVAL_HOURS, DEFAULT_UPDATE_INTERVAL_HOURS))
-    coordinator = MateoMealsCoordinator(hass, cfg, update_hours=update_hours)
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except Exception as err:  # noqa: BLE001
-        logger.warning("Initial Mateo Meals data fetch failed: %s", err)
+    # Entries of the same municipality share one batched coordinator; this is a per-school view.
+    municipality = async_get_municipality_coordinator(hass, cfg.slug, update_hours)
+    horizon_weeks = int(entry.options.get(CONF_HORIZON_WEEKS, DEFAULT_HORIZON_WEEKS))
+    days_ahead = int(entry.options.get(CONF_DAYS_AHEAD, DEFAULT_DAYS_AHEAD))
+    coordinator = MateoMealsCoordinator(
+        hass,
+        cfg,
+        update_hours=update_hours,
+        municipality=municipality,
+        horizon_weeks=horizon_weeks,
+        days_ahead=days_ahead,
+    )
+    # Entities start from the last persisted menu; the network refresh never blocks startup.
+    if await coordinator.async_load_snapshot():
+        logger.debug("Warm-started %s from menu snapshot", school_name)
+
+    async def _initial_refresh() -> None:
+        # Debounced: entries set up together are served by the same batched refresh.
+        await municipality.async_request_refresh()
+        if not municipality.last_update_success:
+            logger.warning(
+                "Initial Mateo Meals data fetch failed: %s", municipality.last_exception
+            )
+
+    entry.async_create_background_task(
+        hass, _initial_refresh(), f"{DOMAIN} initial refresh {entry.entry_id}"
+    )
     COORDINATORS[entry.entry_id] = coordinator
     # Snapshot current options so we can detect which specific values changed later.
     coordinator.options_snapshot = dict(entry.options)  # type: ignore[attr-defined]
@@ -117,9 +290,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:  #
 
         # Otherwise handle a pure polling interval change in-place.
         new_hours = int(new_opts.get(CONF_UPDATE_INTERVAL_HOURS, DEFAULT_UPDATE_INTERVAL_HOURS))
-        new_hours = max(1, new_hours)
-        if not coord.update_interval or coord.update_interval.total_seconds() != new_hours * 3600:
-            coord.update_interval = timedelta(hours=new_hours)
+        coord.update_hours = max(1, new_hours)
+        # The municipality polls at the shortest interval any of its entries asks for.
+        if coord.municipality.async_update_interval():
             await coord.async_request_refresh()
         coord.options_snapshot = dict(new_opts)  # type: ignore[attr-defined]
 
@@ -129,11 +302,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:  #
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:  # noqa: D401
+    # Drop the persisted menu snapshot together with the entry.
+    school_id = int(entry.options.get("school_id", entry.data["school_id"]))
+    key = snapshot_storage_key(entry.data["slug"], school_id)
+    await Store(hass, SNAPSHOT_STORAGE_VERSION, key).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:  # noqa: D401
     # Unload platforms first; only drop coordinator if they unloaded cleanly.
     unloaded = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unloaded:
-        COORDINATORS.pop(entry.entry_id, None)
+        coord = COORDINATORS.pop(entry.entry_id, None)
+        if coord is not None:
+            coord.async_detach()
+            municipality = coord.municipality
+            municipalities = hass.data.get(DOMAIN, {}).get(DATA_MUNICIPALITIES, {})
+            if not municipality.has_views and municipalities.get(municipality.slug) is municipality:
+                municipalities.pop(municipality.slug)
+                await municipality.async_shutdown()
+    if not COORDINATORS:
+        await async_close_menu_archive(hass)
+        await async_close_api_client(hass)
     # If no more entries remain, remove the refresh service to be tidy.
     if not COORDINATORS and DOMAIN in hass.services.async_services():  # type: ignore[attr-defined]
         domain_services = hass.services.async_services().get(DOMAIN, {})  # type: ignore[attr-defined]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from typing import Any
+
+import aiohttp
+from aiohttp import hdrs
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.util.ssl import client_context
+
+from .client import MateoClient
+from .const import (
+    DATA_API_CLIENT,
+    DOMAIN,
+    HTTP_DNS_CACHE_SECONDS,
+    HTTP_KEEPALIVE_SECONDS,
+    HTTP_LIMIT_PER_HOST,
+    USER_AGENT,
+)
+
+# hass.data[DOMAIN] key of the pending EVENT_HOMEASSISTANT_CLOSE listener for the client.
+_DATA_CLOSE_LISTENER = "api_client_close_listener"
+
+
+def _async_create_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    # Own connector so Mateo traffic gets keep-alive, a DNS cache and its own per-host bound.
+    connector = aiohttp.TCPConnector(
+        limit_per_host=HTTP_LIMIT_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+        keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+        enable_cleanup_closed=True,
+        ssl=client_context(),
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={hdrs.USER_AGENT: USER_AGENT, hdrs.ACCEPT_ENCODING: "gzip, deflate"},
+    )
+
+
+def async_get_api_client(hass: HomeAssistant) -> MateoClient:
+    """Return the integration's shared MateoClient, creating its session on first use."""
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    client: MateoClient | None = domain_data.get(DATA_API_CLIENT)
+    if client is None:
+        client = domain_data[DATA_API_CLIENT] = MateoClient(_async_create_session(hass))
+
+        async def _async_close(event: Event) -> None:
+            # The listener has fired; there is nothing left to unsubscribe.
+            hass.data.get(DOMAIN, {}).pop(_DATA_CLOSE_LISTENER, None)
+            await async_close_api_client(hass)
+
+        domain_data[_DATA_CLOSE_LISTENER] = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, _async_close
+        )
+    return client
+
+
+async def async_close_api_client(hass: HomeAssistant) -> None:
+    domain_data: dict[str, Any] = hass.data.get(DOMAIN, {})
+    # A client created again after an entry reload registers its own listener.
+    if (unsub := domain_data.pop(_DATA_CLOSE_LISTENER, None)) is not None:
+        unsub()
+    client: MateoClient | None = domain_data.pop(DATA_API_CLIENT, None)
+    if client is not None:
+        await client.session.close()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from datetime import date
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .client import meal_from_name
+from .const import ARCHIVE_FILENAME, DATA_ARCHIVE, DOMAIN
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meals (
+    slug TEXT NOT NULL,
+    school_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    meals TEXT NOT NULL,
+    PRIMARY KEY (slug, school_id, date)
+) WITHOUT ROWID
+"""
+
+# Unchanged days are skipped so a refresh of known weeks does not rewrite the file.
+_UPSERT = """
+INSERT INTO meals (slug, school_id, date, meals) VALUES (?, ?, ?, ?)
+ON CONFLICT (slug, school_id, date) DO UPDATE SET meals = excluded.meals
+WHERE meals IS NOT excluded.meals
+"""
+
+_RANGE = """
+SELECT date, meals FROM meals
+WHERE slug = ? AND school_id = ? AND date BETWEEN ? AND ?
+ORDER BY date
+"""
+
+
+class MenuArchive:
+    """Append-only history of served menus in SQLite, keyed by (slug, school_id, date).
+
+    Every refresh upserts the days it fetched, so history grows incrementally and range
+    reads are primary-key scans that never load more than the requested window. A day holds
+    its meals as parsed (name, type, categories, allergens); older rows hold names only.
+    All database work runs in the executor; one connection is shared behind a lock.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        self._hass = hass
+        self._path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _store(self, slug: str, schools: dict[int, dict[str, list[Any]]]) -> None:
+        rows = [
+            (slug, school_id, day, json.dumps(meals, ensure_ascii=False))
+            for school_id, meals_by_date in schools.items()
+            for day, meals in meals_by_date.items()
+        ]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(_UPSERT, rows)
+
+    def _range(self, slug: str, school_id: int, start: str, end: str) -> dict[str, list[Any]]:
+        with self._lock:
+            cursor = self._connection().execute(_RANGE, (slug, school_id, start, end))
+            return {day: json.loads(raw) for day, raw in cursor}
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def async_store(self, slug: str, schools: dict[int, dict[str, list[Any]]]) -> None:
+        """Upsert the meals per date (meal dicts or names) of one or more schools."""
+        await self._hass.async_add_executor_job(self._store, slug, schools)
+
+    async def async_range(
+        self, slug: str, school_id: int, start: date, end: date
+    ) -> dict[str, list[str]]:
+        """Return archived meals_by_date (meal names) for start..end (inclusive)."""
+        return {
+            day: [meal if isinstance(meal, str) else meal["name"] for meal in meals]
+            for day, meals in (await self._async_range(slug, school_id, start, end)).items()
+        }
+
+    async def async_range_meals(
+        self, slug: str, school_id: int, start: date, end: date
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Return archived meals (see client.parse_week_meals) for start..end (inclusive)."""
+        return {
+            day: [meal_from_name(meal) if isinstance(meal, str) else meal for meal in meals]
+            for day, meals in (await self._async_range(slug, school_id, start, end)).items()
+        }
+
+    async def _async_range(
+        self, slug: str, school_id: int, start: date, end: date
+    ) -> dict[str, list[Any]]:
+        return await self._hass.async_add_executor_job(
+            self._range, slug, school_id, start.isoformat(), end.isoformat()
+        )
+
+    async def async_close(self) -> None:
+        await self._hass.async_add_executor_job(self._close)
+
+
+def async_get_menu_archive(hass: HomeAssistant) -> MenuArchive:
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    archive = domain_data.get(DATA_ARCHIVE)
+    if archive is None:
+        archive = domain_data[DATA_ARCHIVE] = MenuArchive(hass, hass.config.path(ARCHIVE_FILENAME))
+    return archive
+
+
+async def async_close_menu_archive(hass: HomeAssistant) -> None:
+    archive: MenuArchive | None = hass.data.get(DOMAIN, {}).pop(DATA_ARCHIVE, None)
+    if archive is not None:
+        await archive.async_close()
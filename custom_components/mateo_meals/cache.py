@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_DISTRICTS_CACHE, DISTRICTS_CACHE_TTL_SECONDS, DOMAIN
+
+
+class DistrictsCache:
+    """Municipality-scoped cache of parsed districts.json payloads.
+
+    Entries expire after a TTL. Concurrent lookups for the same slug share a
+    single in-flight download (single-flight) instead of each issuing their own.
+    """
+
+    def __init__(self, ttl_seconds: float = DISTRICTS_CACHE_TTL_SECONDS) -> None:
+        self._ttl = ttl_seconds
+        self._entries: dict[str, tuple[float, Any]] = {}
+        self._inflight: dict[str, asyncio.Task[Any]] = {}
+
+    async def async_get(self, slug: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        cached = self._entries.get(slug)
+        if cached is not None and time.monotonic() - cached[0] < self._ttl:
+            return cached[1]
+        task = self._inflight.get(slug)
+        if task is None:
+            task = asyncio.ensure_future(self._async_load(slug, fetch))
+            self._inflight[slug] = task
+        # Shield so a cancelled waiter does not abort the download for the others.
+        return await asyncio.shield(task)
+
+    async def _async_load(self, slug: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            payload = await fetch()
+            self._entries[slug] = (time.monotonic(), payload)
+            return payload
+        finally:
+            self._inflight.pop(slug, None)
+
+    def invalidate(self, slug: str | None = None) -> None:
+        """Drop one municipality (or all) so the next lookup downloads again."""
+        if slug is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(slug, None)
+
+
+def async_get_districts_cache(hass: HomeAssistant) -> DistrictsCache:
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    cache = domain_data.get(DATA_DISTRICTS_CACHE)
+    if cache is None:
+        cache = domain_data[DATA_DISTRICTS_CACHE] = DistrictsCache()
+    return cache
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
-from datetime import datetime, time, timedelta, timezone
-from typing import Any, Iterable
+import zoneinfo
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta, tzinfo
+from typing import Any
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import COORDINATORS
+from .archive import async_get_menu_archive
 from .const import (
     DOMAIN,
     CONF_SERVING_START,
@@ -22,6 +25,8 @@ from .const import (
     DEFAULT_INCLUDE_WEEKENDS,
 )
 from .coordinator import MateoMealsCoordinator, MateoConfig
+from .entity import MateoCoordinatorEntity
+from .school_days import SchoolDays
 
 
 async def async_setup_entry(
@@ -65,7 +70,26 @@ def _parse_hhmm(value: str) -> time:
     return time(hour=hour, minute=minute)
 
 
-class MateoMealsCalendarEntity(CoordinatorEntity[MateoMealsCoordinator], CalendarEntity):
+@dataclass(frozen=True, slots=True)
+class _EventIndex:
+    """Immutable, start-sorted events for one coordinator data version."""
+
+    data: Any
+    tzinfo: tzinfo
+    events: tuple[CalendarEvent, ...]
+    days: tuple[date, ...]
+    starts: tuple[datetime, ...]
+    ends: tuple[datetime, ...]
+    school_days: SchoolDays
+
+    def between(self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        """Events overlapping [start, end]; every event lasts the same serving window."""
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, end)
+        return list(self.events[lo:hi])
+
+
+class MateoMealsCalendarEntity(MateoCoordinatorEntity, CalendarEntity):
     _attr_has_entity_name = True
 
     def __init__(
@@ -86,81 +110,118 @@ class MateoMealsCalendarEntity(CoordinatorEntity[MateoMealsCoordinator], Calenda
         self._serving_end = _parse_hhmm(serving_end)
         self._days_ahead = max(1, min(14, days_ahead))
         self._include_weekends = include_weekends
-        self._current_event: CalendarEvent | None = None
+        self._index: _EventIndex | None = None
 
     async def async_update(self) -> None:  # fallback if HA calls manual update
         await self.coordinator.async_request_refresh()
 
     @property
     def event(self) -> CalendarEvent | None:  # Next ongoing or upcoming event
-        self._update_cached_event()
-        return self._current_event
-
-    def _update_cached_event(self) -> None:
-        tzinfo = None
-        if getattr(self, "hass", None):  # type: ignore[attr-defined]
-            tz_name = getattr(self.hass.config, "time_zone", None)  # type: ignore[attr-defined]
-            if tz_name:
-                try:
-                    import zoneinfo  # noqa: PLC0415
-
-                    tzinfo = zoneinfo.ZoneInfo(tz_name)
-                except Exception:  # noqa: BLE001
-                    tzinfo = timezone.utc
-        if tzinfo is None:
-            tzinfo = timezone.utc
-        now = datetime.now(tzinfo)
-        events = list(self._iter_events(now, self._days_ahead))
-        # find first event with end >= now
-        for ev in events:
-            if ev.end >= now:
-                self._current_event = ev
-                return
-        self._current_event = None
+        index = self._event_index()
+        now = datetime.now(index.tzinfo)
+        # Only the next days_ahead school days with a menu are candidates.
+        first = bisect_left(index.days, now.date())
+        last = min(first + self._days_ahead, len(index.events))
+        pos = bisect_left(index.ends, now, first, last)
+        return index.events[pos] if pos < last else None
+
+    def _rendered(self) -> tuple[Any, ...]:
+        # The attributes are options only; the state follows the next event.
+        return (self.event,)
 
     async def async_get_events(self, hass: HomeAssistant, start_date: datetime, end_date: datetime) -> list[CalendarEvent]:  # noqa: D401
-        events: list[CalendarEvent] = []
-        # Limit iteration window to configured days ahead from 'start_date'
-        window_days = self._days_ahead
-        for ev in self._iter_events(start_date, window_days):
-            if ev.start <= end_date and ev.end >= start_date:
-                events.append(ev)
-        return events
-
-    def _iter_events(self, reference: datetime, days: int) -> Iterable[CalendarEvent]:
-        data = self.coordinator.data or {}
-        meals_by_date: dict[str, list[str]] = data.get("meals_by_date") or {}
-        tzinfo = None
+        index = self._event_index()
+        events = index.between(start_date, end_date)
+        # Days before the coordinator's current weeks come from the on-disk archive.
+        range_end = end_date.astimezone(index.tzinfo).date()
+        first_day = index.days[0] if index.days else range_end + timedelta(days=1)
+        history_start = start_date.astimezone(index.tzinfo).date()
+        if history_start >= first_day:
+            return events
+        history_end = min(range_end, first_day - timedelta(days=1))
+        try:
+            archived = await async_get_menu_archive(hass).async_range(
+                self._cfg.slug, self._cfg.school_id, history_start, history_end
+            )
+        except Exception:  # noqa: BLE001
+            return events
+        history = [
+            ev
+            for key, names in archived.items()
+            if (ev := self._make_event(key, names, index.tzinfo, index.school_days)) is not None
+            and ev.start <= end_date
+            and ev.end >= start_date
+        ]
+        return history + events
+
+    def _tzinfo(self) -> tzinfo:
         if getattr(self, "hass", None):  # type: ignore[attr-defined]
             tz_name = getattr(self.hass.config, "time_zone", None)  # type: ignore[attr-defined]
             if tz_name:
                 try:
-                    import zoneinfo  # noqa: PLC0415
-
-                    tzinfo = zoneinfo.ZoneInfo(tz_name)
+                    return zoneinfo.ZoneInfo(tz_name)  # instances are cached per key
                 except Exception:  # noqa: BLE001
-                    tzinfo = timezone.utc
-        if tzinfo is None:
-            tzinfo = timezone.utc
-        today_local = reference.date()
-        produced = 0
-        cursor = today_local
-        # Iterate calendar days until we have 'days' school days (or hit a safety cap)
-        safety = 0
-        while produced < days and safety < days * 3:  # safety cap
-            safety += 1
-            if not self._include_weekends and cursor.weekday() >= 5:
-                cursor += timedelta(days=1)
+                    return UTC
+        return UTC
+
+    def _event_index(self) -> _EventIndex:
+        """Return the event index, rebuilding it only when coordinator data or time zone changed."""
+        data = self.coordinator.data
+        tz = self._tzinfo()
+        index = self._index
+        if index is None or index.data is not data or index.tzinfo is not tz:
+            index = self._index = self._build_index(data, tz)
+        return index
+
+    def _make_event(
+        self, key: str, names: list[str], tz: tzinfo, school_days: SchoolDays
+    ) -> CalendarEvent | None:
+        if not names:
+            return None
+        try:
+            day = date.fromisoformat(key)
+        except ValueError:
+            return None
+        if not school_days.is_school_day(day):
+            # Weekends (unless included) and the school's study days and breaks.
+            return None
+        start_dt, end_dt = self._serving_window(day, tz)
+        summary = "; ".join(names)
+        return CalendarEvent(summary=summary, start=start_dt, end=end_dt, description=summary)
+
+    def _serving_window(self, day: date, tz: tzinfo) -> tuple[datetime, datetime]:
+        return (
+            datetime.combine(day, self._serving_start, tz),
+            datetime.combine(day, self._serving_end, tz),
+        )
+
+    def _build_index(self, data: Any, tz: tzinfo) -> _EventIndex:
+        meals_by_date: dict[str, list[str]] = (data or {}).get("meals_by_date") or {}
+        school_days = self.coordinator.school_days(self._include_weekends)
+        events: list[CalendarEvent] = []
+        days: list[date] = []
+        starts: list[datetime] = []
+        ends: list[datetime] = []
+        for key in sorted(meals_by_date):
+            event = self._make_event(key, meals_by_date[key], tz, school_days)
+            if event is None:
                 continue
-            key = cursor.isoformat()
-            names = meals_by_date.get(key) or []
-            if names:
-                start_dt = datetime.combine(cursor, self._serving_start, tzinfo)
-                end_dt = datetime.combine(cursor, self._serving_end, tzinfo)
-                summary = "; ".join(names)
-                yield CalendarEvent(summary=summary, start=start_dt, end=end_dt, description=summary)
-                produced += 1
-            cursor += timedelta(days=1)
+            day = date.fromisoformat(key)  # valid, _make_event accepted it
+            events.append(event)
+            days.append(day)
+            # Typed bounds for the bisects (CalendarEvent.start is date | datetime).
+            start_dt, end_dt = self._serving_window(day, tz)
+            starts.append(start_dt)
+            ends.append(end_dt)
+        return _EventIndex(
+            data=data,
+            tzinfo=tz,
+            events=tuple(events),
+            days=tuple(days),
+            starts=tuple(starts),
+            ends=tuple(ends),
+            school_days=school_days,
+        )
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
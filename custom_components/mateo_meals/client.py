@@ -0,0 +1,413 @@
+"""Async client for the Mateo menu object store.
+
+Plain asyncio + aiohttp over a caller-supplied session. The integration wraps it (see
+api.py); the load-test script and the test suite drive it directly. It is part of the
+integration package, so importing it requires Home Assistant to be installed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Protocol
+
+import aiohttp
+from aiohttp import hdrs
+
+from .const import (
+    HTTP_RETRIES,
+    HTTP_RETRY_BACKOFF_SECONDS,
+    MATEO_BASE_URL,
+    PATH_DISTRICTS,
+    PATH_MENU,
+    PATH_SHARED,
+    REQUEST_TIMEOUT_SECONDS,
+)
+
+# Week file naming: {school_id}_{weeknum}.json or the legacy {school_id}_{YYYY-Www}.json
+SCHEME_NUMERIC = "numeric"
+SCHEME_ISO_WEEK = "iso_week"
+SCHEMES = (SCHEME_NUMERIC, SCHEME_ISO_WEEK)
+
+
+class MateoApiError(Exception):
+    """Base class for errors talking to the Mateo object store."""
+
+
+class MateoConnectionError(MateoApiError):
+    """Network failure or timeout; retried."""
+
+
+class MateoResponseError(MateoApiError):
+    """Unexpected HTTP status; 5xx and 429 are retried."""
+
+    def __init__(self, url: str, status: int, body: str = "") -> None:
+        super().__init__(f"HTTP {status} for {url}" + (f" body={body}" if body else ""))
+        self.url = url
+        self.status = status
+
+    @property
+    def retriable(self) -> bool:
+        return self.status >= 500 or self.status == 429
+
+
+class MateoNotFoundError(MateoResponseError):
+    """No object at this URL (404, or 403 since the bucket does not allow listing)."""
+
+
+class _NotModifiedWithoutPayload(MateoResponseError):
+    """304 to a conditional request whose cached payload is gone; its validator was dropped."""
+
+
+class ConditionalCache(Protocol):
+    """Validator storage used for conditional requests (see http_cache.ValidatorStore)."""
+
+    def request_headers(self, url: str) -> dict[str, str]: ...
+
+    def payload(self, url: str) -> Any: ...
+
+    def remember(
+        self, url: str, etag: str | None, last_modified: str | None, payload: Any
+    ) -> None: ...
+
+    def forget(self, url: str) -> None: ...
+
+
+class RequestObserver(Protocol):
+    """Receives one call per HTTP attempt (see metrics.FetchMetrics).
+
+    status is None for connection errors and timeouts; size is the decoded body length of a
+    200 response; decode_seconds is the JSON decoding time, None if nothing was decoded.
+    """
+
+    def request_finished(
+        self,
+        url: str,
+        status: int | None,
+        seconds: float,
+        size: int,
+        decode_seconds: float | None,
+    ) -> None: ...
+
+
+@dataclass(frozen=True, slots=True)
+class Municipality:
+    slug: str
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class District:
+    id: int
+    name: str
+    exception_days: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass(frozen=True, slots=True)
+class WeekMenu:
+    slug: str
+    school_id: int
+    monday: date
+    scheme: str
+    meals_by_date: dict[str, list[str]]
+
+
+def iso_week_string(d: date) -> str:
+    year, week, _ = d.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def week_url(
+    slug: str,
+    school_id: int,
+    monday: date,
+    scheme: str = SCHEME_NUMERIC,
+    base_url: str = MATEO_BASE_URL,
+) -> str:
+    weeknum = monday.isocalendar()[1] if scheme == SCHEME_NUMERIC else iso_week_string(monday)
+    return base_url + PATH_MENU.format(slug=slug, school_id=school_id, weeknum=weeknum)
+
+
+def date_from_iso(dt_str: str) -> date | None:
+    try:
+        # API returns e.g. 2025-09-15T00:00:00.000Z; the date component is the menu day.
+        return datetime.fromisoformat(dt_str.replace("Z", "+00:00")).date()
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def _label_names(values: Any) -> list[str]:
+    """Names of a meal's categories or allergens (objects with a name, or plain strings)."""
+    if not isinstance(values, list):
+        return []
+    names = []
+    for value in values:
+        name = value.get("name") if isinstance(value, dict) else value
+        if isinstance(name, str) and name.strip():
+            names.append(name.strip())
+    return names
+
+
+def meal_from_name(name: str) -> dict[str, Any]:
+    """A meal known only by its name (e.g. archived before details were kept).
+
+    allergens is None rather than empty: nothing is known about them.
+    """
+    return {"name": name, "type": None, "categories": [], "allergens": None}
+
+
+def parse_week_meals(payloads: Iterable[Any]) -> dict[str, list[dict[str, Any]]]:
+    """Map ISO date -> meals for the weekdays present in the week payloads.
+
+    Each meal is {"name", "type", "categories", "allergens"}: the stripped name, the meal
+    type (e.g. "Lunch 1") or None, and the category and allergen names.
+    """
+    meals_by_date: dict[str, list[dict[str, Any]]] = {}
+    for payload in payloads:
+        if not isinstance(payload, list):
+            continue
+        for day in payload:
+            dts = day.get("date")
+            d_local = date_from_iso(dts) if dts else None
+            if not d_local or d_local.weekday() > 4:
+                continue
+            meals = []
+            for meal in day.get("meals") or []:
+                if not isinstance(meal, dict):
+                    continue
+                name = meal.get("name")
+                if not isinstance(name, str) or not name.strip():
+                    continue
+                meal_type = meal.get("type")
+                meals.append(
+                    {
+                        "name": name.strip(),
+                        "type": meal_type.strip()
+                        if isinstance(meal_type, str) and meal_type.strip()
+                        else None,
+                        "categories": _label_names(meal.get("categories")),
+                        "allergens": _label_names(meal.get("allergens")),
+                    }
+                )
+            if meals:
+                meals_by_date[d_local.isoformat()] = meals
+    return meals_by_date
+
+
+def meal_names(meals_by_date: dict[str, list[dict[str, Any]]]) -> dict[str, list[str]]:
+    """Reduce parse_week_meals output to the meal names per date."""
+    return {day: [meal["name"] for meal in meals] for day, meals in meals_by_date.items()}
+
+
+def parse_week_payloads(payloads: Iterable[Any]) -> dict[str, list[str]]:
+    """Map ISO date -> normalized meal names for the weekdays present in the week payloads."""
+    return meal_names(parse_week_meals(payloads))
+
+
+def parse_exception_days(districts: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Exception days of all districts with start/end reduced to ISO dates (input untouched)."""
+    exc: list[dict[str, Any]] = []
+    for d in districts:
+        for raw in d.get("districts_exception_days", []) or []:
+            ex = dict(raw)
+            start = ex.get("start")
+            end = ex.get("end")
+            if start:
+                sdt = date_from_iso(start)
+                ex["start"] = sdt.isoformat() if sdt else start
+            if end:
+                edt = date_from_iso(end)
+                ex["end"] = edt.isoformat() if edt else end
+            exc.append(ex)
+    return exc
+
+
+def exception_days_by_school(
+    districts: Iterable[dict[str, Any]],
+) -> dict[int, list[dict[str, Any]]]:
+    """Parsed exception days keyed by district (school) id; districts without id are skipped."""
+    by_school: dict[int, list[dict[str, Any]]] = {}
+    for d in districts:
+        try:
+            school_id = int(d["id"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        by_school.setdefault(school_id, []).extend(parse_exception_days([d]))
+    return by_school
+
+
+def parse_municipalities(payload: Any) -> list[Municipality]:
+    """Unique municipalities of municipalities.json, sorted by name."""
+    seen: dict[str, Municipality] = {}
+    for region in payload or []:
+        for m in region.get("municipalities", []):
+            if "slug" in m and "name" in m and m["slug"] not in seen:
+                seen[m["slug"]] = Municipality(slug=m["slug"], name=m["name"])
+    return sorted(seen.values(), key=lambda m: m.name.lower())
+
+
+def districts_list(payload: Any) -> list[dict[str, Any]]:
+    return payload.get("districts", []) if isinstance(payload, dict) else []
+
+
+class MateoClient:
+    """Typed access to the Mateo object store over a caller-provided aiohttp session.
+
+    base_url points the client at another host, e.g. the local stand-in server used for
+    load tests (tests/mateo_server.py); URLs of the public object store passed in by callers
+    are redirected there as well.
+
+    Connection errors, timeouts, 429 and 5xx responses are retried with jittered
+    exponential backoff; everything else surfaces as a MateoApiError subclass.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        *,
+        timeout: float = REQUEST_TIMEOUT_SECONDS,
+        retries: int = HTTP_RETRIES,
+        backoff: float = HTTP_RETRY_BACKOFF_SECONDS,
+        base_url: str = MATEO_BASE_URL,
+    ) -> None:
+        self._session = session
+        self._base_url = base_url.rstrip("/")
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._retries = retries
+        self._backoff = backoff
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        return self._session
+
+    def _resolve(self, url: str) -> str:
+        if self._base_url != MATEO_BASE_URL and url.startswith(MATEO_BASE_URL):
+            return self._base_url + url[len(MATEO_BASE_URL) :]
+        return url
+
+    async def async_get_json(
+        self,
+        url: str,
+        validators: ConditionalCache | None = None,
+        observer: RequestObserver | None = None,
+    ) -> Any:
+        url = self._resolve(url)
+        attempt = 0
+        while True:
+            try:
+                return await self._async_get_json_once(url, validators, observer)
+            except _NotModifiedWithoutPayload:
+                # Ask again right away; without validators the server has to send the body.
+                continue
+            except MateoResponseError as err:
+                if not err.retriable or attempt >= self._retries:
+                    raise
+            except MateoConnectionError:
+                if attempt >= self._retries:
+                    raise
+            await asyncio.sleep(self._backoff * 2**attempt * random.uniform(0.5, 1.5))  # noqa: S311
+            attempt += 1
+
+    async def _async_get_json_once(
+        self, url: str, validators: ConditionalCache | None, observer: RequestObserver | None
+    ) -> Any:
+        headers = validators.request_headers(url) if validators is not None else {}
+        started = time.perf_counter()
+        status: int | None = None
+        size = 0
+        decode_seconds: float | None = None
+        try:
+            async with self._session.get(url, headers=headers, timeout=self._timeout) as resp:
+                status = resp.status
+                if resp.status == 304 and validators is not None:
+                    cached = validators.payload(url)
+                    if cached is not None:
+                        return cached
+                    if headers:
+                        validators.forget(url)
+                        raise _NotModifiedWithoutPayload(url, resp.status)
+                if resp.status in (403, 404):
+                    raise MateoNotFoundError(url, resp.status)
+                if resp.status != 200:
+                    text = await resp.text()
+                    raise MateoResponseError(url, resp.status, text[:120])
+                body = await resp.read()
+                size = len(body)
+                decode_started = time.perf_counter()
+                # Like resp.json(): an empty body is None rather than a decode error.
+                payload = json.loads(body) if body.strip() else None
+                decode_seconds = time.perf_counter() - decode_started
+                if validators is not None:
+                    validators.remember(
+                        url,
+                        resp.headers.get(hdrs.ETAG),
+                        resp.headers.get(hdrs.LAST_MODIFIED),
+                        payload,
+                    )
+                return payload
+        except (aiohttp.ClientError, TimeoutError) as err:
+            status = None
+            raise MateoConnectionError(f"{type(err).__name__} for {url}: {err}") from err
+        finally:
+            if observer is not None:
+                observer.request_finished(
+                    url, status, time.perf_counter() - started, size, decode_seconds
+                )
+
+    async def async_get_municipalities(self) -> list[Municipality]:
+        return parse_municipalities(await self.async_get_json(self._base_url + PATH_SHARED))
+
+    async def async_get_districts(self, slug: str) -> list[District]:
+        payload = await self.async_get_json(self._base_url + PATH_DISTRICTS.format(slug=slug))
+        return [
+            District(
+                id=int(d["id"]),
+                name=d.get("name") or str(d["id"]),
+                exception_days=parse_exception_days([d]),
+            )
+            for d in districts_list(payload)
+            if d.get("id") is not None
+        ]
+
+    async def async_get_week_menu(
+        self,
+        slug: str,
+        school_id: int,
+        monday: date,
+        schemes: Iterable[str] = SCHEMES,
+    ) -> WeekMenu | None:
+        """Menu of the week starting at monday, trying each URL scheme; None if not published."""
+        errors: list[MateoApiError] = []
+        for scheme in schemes:
+            try:
+                url = week_url(slug, school_id, monday, scheme, self._base_url)
+                payload = await self.async_get_json(url)
+            except MateoApiError as err:
+                errors.append(err)
+                continue
+            return WeekMenu(
+                slug=slug,
+                school_id=school_id,
+                monday=monday,
+                scheme=scheme,
+                meals_by_date=parse_week_payloads([payload]),
+            )
+        if errors and not all(isinstance(err, MateoNotFoundError) for err in errors):
+            raise errors[0]
+        return None
+
+    async def async_iter_week_menus(
+        self, slug: str, school_id: int, start: date, end: date
+    ) -> AsyncIterator[WeekMenu]:
+        """Yield the published week menus covering start..end in order, one request at a time."""
+        monday = start - timedelta(days=start.weekday())
+        while monday <= end:
+            menu = await self.async_get_week_menu(slug, school_id, monday)
+            if menu is not None:
+                yield menu
+            monday += timedelta(weeks=1)
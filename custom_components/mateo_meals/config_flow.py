@@ -1,18 +1,19 @@
 from __future__ import annotations
 
 import logging
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers import aiohttp_client
 
+from .api import async_get_api_client
+from .cache import async_get_districts_cache
+from .client import parse_municipalities, week_url
 from .const import (
     BASE_DISTRICTS,
-    BASE_MENU,
     BASE_SHARED,
     DOMAIN,
     CONF_DAYS_AHEAD,
@@ -20,25 +21,25 @@ from .const import (
     CONF_SERVING_START,
     CONF_SERVING_END,
     CONF_INCLUDE_WEEKENDS,
+    CONF_HORIZON_WEEKS,
     DEFAULT_DAYS_AHEAD,
     DEFAULT_UPDATE_INTERVAL_HOURS,
     DEFAULT_SERVING_START,
     DEFAULT_SERVING_END,
     DEFAULT_INCLUDE_WEEKENDS,
+    DEFAULT_HORIZON_WEEKS,
+    MAX_HORIZON_WEEKS,
 )
 
 
-def _iso_week_string(dt: datetime) -> str:
-    year, week, _ = dt.isocalendar()
-    return f"{year}-W{week:02d}"
+async def _http_json(hass: HomeAssistant, url: str) -> Any:
+    return await async_get_api_client(hass).async_get_json(url)
 
 
-async def _http_json(hass: HomeAssistant, url: str) -> Any:
-    session = aiohttp_client.async_get_clientsession(hass)
-    async with session.get(url, timeout=20) as resp:
-        if resp.status != 200:
-            raise RuntimeError(f"HTTP {resp.status} for {url}")
-        return await resp.json(content_type=None)
+async def _async_get_districts(hass: HomeAssistant, slug: str) -> Any:
+    """Return districts.json for a municipality through the shared cache."""
+    url = BASE_DISTRICTS.format(slug=slug)
+    return await async_get_districts_cache(hass).async_get(slug, lambda: _http_json(hass, url))
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -67,18 +68,9 @@ class MateoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         try:
             data = await _http_json(self.hass, BASE_SHARED)
-            municipalities: list[dict[str, Any]] = []
-            for region in data or []:
-                for m in region.get("municipalities", []):
-                    if "slug" in m and "name" in m:
-                        municipalities.append({"slug": m["slug"], "name": m["name"]})
-            seen: set[str] = set()
-            unique_m: list[dict[str, Any]] = []
-            for m in municipalities:
-                if m["slug"] not in seen:
-                    unique_m.append(m)
-                    seen.add(m["slug"])
-            self._municipalities = sorted(unique_m, key=lambda x: x["name"].lower())
+            self._municipalities = [
+                {"slug": m.slug, "name": m.name} for m in parse_municipalities(data)
+            ]
         except Exception:
             return self.async_show_form(
                 step_id="user",
@@ -94,12 +86,11 @@ class MateoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         assert self._selected_slug is not None
         assert self._selected_municipality_name is not None
         slug = self._selected_slug
-        districts_url = BASE_DISTRICTS.format(slug=slug)
 
         if user_input is not None:
             school_id = int(user_input["school"])
             try:
-                districts_payload = await _http_json(self.hass, districts_url)
+                districts_payload = await _async_get_districts(self.hass, slug)
             except Exception:
                 return self.async_show_form(
                     step_id="school",
@@ -121,12 +112,9 @@ class MateoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             await self.async_set_unique_id(unique_id)
             self._abort_if_unique_id_configured()
             try:
-                now_utc = datetime.now(UTC)
-                week = _iso_week_string(now_utc)
-                await _http_json(
-                    self.hass,
-                    BASE_MENU.format(slug=slug, school_id=school_id, week=week),
-                )
+                today = datetime.now(UTC).date()
+                monday = today - timedelta(days=today.weekday())
+                await _http_json(self.hass, week_url(slug, school_id, monday))
             except Exception:  # noqa: BLE001
                 _LOGGER.debug(
                     "Optional initial menu fetch failed for %s/%s", slug, school_id
@@ -141,7 +129,7 @@ class MateoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return self.async_create_entry(title=title, data=data)
 
         try:
-            districts_payload = await _http_json(self.hass, districts_url)
+            districts_payload = await _async_get_districts(self.hass, slug)
         except Exception:
             return self.async_show_form(
                 step_id="school",
@@ -175,9 +163,8 @@ class MateoOptionsFlowHandler(config_entries.OptionsFlow):
         slug = self.config_entry.data.get("slug")
         if not slug:
             return self.async_abort(reason="unknown")
-        districts_url = BASE_DISTRICTS.format(slug=slug)
         try:
-            payload = await _http_json(hass, districts_url)
+            payload = await _async_get_districts(hass, slug)
         except Exception:
             return self.async_show_form(
                 step_id="school",
@@ -194,6 +181,7 @@ class MateoOptionsFlowHandler(config_entries.OptionsFlow):
         serving_start = opts.get(CONF_SERVING_START, DEFAULT_SERVING_START)
         serving_end = opts.get(CONF_SERVING_END, DEFAULT_SERVING_END)
         include_weekends = bool(opts.get(CONF_INCLUDE_WEEKENDS, DEFAULT_INCLUDE_WEEKENDS))
+        horizon_weeks = int(opts.get(CONF_HORIZON_WEEKS, DEFAULT_HORIZON_WEEKS))
 
         if user_input is None:
             base_schema = (
@@ -207,6 +195,9 @@ class MateoOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Required(CONF_SERVING_START, default=serving_start): str,
                 vol.Required(CONF_SERVING_END, default=serving_end): str,
                 vol.Required(CONF_INCLUDE_WEEKENDS, default=include_weekends): bool,
+                vol.Required(CONF_HORIZON_WEEKS, default=horizon_weeks): vol.All(
+                    int, vol.Range(min=1, max=MAX_HORIZON_WEEKS)
+                ),
             }
             schema = vol.Schema({**base_schema, **extra_schema})
             return self.async_show_form(step_id="school", data_schema=schema)
@@ -229,6 +220,7 @@ class MateoOptionsFlowHandler(config_entries.OptionsFlow):
         ss = user_input.get(CONF_SERVING_START, serving_start)
         se = user_input.get(CONF_SERVING_END, serving_end)
         iw = bool(user_input.get(CONF_INCLUDE_WEEKENDS, include_weekends))
+        hw = int(user_input.get(CONF_HORIZON_WEEKS, horizon_weeks))
         errors: dict[str, str] = {}
         if not _valid_time(ss):
             errors[CONF_SERVING_START] = "invalid_time"
@@ -246,6 +238,9 @@ class MateoOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Required(CONF_SERVING_START, default=ss): str,
                 vol.Required(CONF_SERVING_END, default=se): str,
                 vol.Required(CONF_INCLUDE_WEEKENDS, default=iw): bool,
+                vol.Required(CONF_HORIZON_WEEKS, default=hw): vol.All(
+                    int, vol.Range(min=1, max=MAX_HORIZON_WEEKS)
+                ),
             }
             schema = vol.Schema({**base_schema, **extra_schema})
             return self.async_show_form(step_id="school", data_schema=schema, errors=errors)
@@ -260,6 +255,7 @@ class MateoOptionsFlowHandler(config_entries.OptionsFlow):
                 CONF_SERVING_START: ss,
                 CONF_SERVING_END: se,
                 CONF_INCLUDE_WEEKENDS: iw,
+                CONF_HORIZON_WEEKS: hw,
             },
         )
 
@@ -1,8 +1,12 @@
 DOMAIN = "mateo_meals"
 DEFAULT_NAME = "Skollunch"
-BASE_SHARED = "https://objects.dc-fbg1.glesys.net/mateo.shared/mateo-menu/municipalities.json"
-BASE_DISTRICTS = "https://objects.dc-fbg1.glesys.net/mateo.{slug}/menus/app/districts.json"
-BASE_MENU = "https://objects.dc-fbg1.glesys.net/mateo.{slug}/menus/app/{school_id}_{weeknum}.json"
+MATEO_BASE_URL = "https://objects.dc-fbg1.glesys.net"
+PATH_SHARED = "/mateo.shared/mateo-menu/municipalities.json"
+PATH_DISTRICTS = "/mateo.{slug}/menus/app/districts.json"
+PATH_MENU = "/mateo.{slug}/menus/app/{school_id}_{weeknum}.json"
+BASE_SHARED = MATEO_BASE_URL + PATH_SHARED
+BASE_DISTRICTS = MATEO_BASE_URL + PATH_DISTRICTS
+BASE_MENU = MATEO_BASE_URL + PATH_MENU
 
 # Option keys
 CONF_DAYS_AHEAD = "days_ahead"
@@ -10,6 +14,7 @@ CONF_UPDATE_INTERVAL_HOURS = "update_interval_hours"
 CONF_SERVING_START = "serving_start"  # HH:MM local time
 CONF_SERVING_END = "serving_end"  # HH:MM local time
 CONF_INCLUDE_WEEKENDS = "include_weekends"
+CONF_HORIZON_WEEKS = "horizon_weeks"  # number of menu weeks to keep, starting with the current one
 
 # Defaults
 DEFAULT_DAYS_AHEAD = 5  # today + following 4 days
@@ -17,3 +22,74 @@ DEFAULT_UPDATE_INTERVAL_HOURS = 4
 DEFAULT_SERVING_START = "10:30"
 DEFAULT_SERVING_END = "13:30"
 DEFAULT_INCLUDE_WEEKENDS = False
+MAX_DAYS_AHEAD = 14  # upper bound of the days_ahead option
+DEFAULT_HORIZON_WEEKS = 2  # current + next week
+MAX_HORIZON_WEEKS = 6
+
+# Network fan-out: at most this many requests in flight per coordinator, each bounded by a timeout.
+MAX_CONCURRENT_REQUESTS = 4
+REQUEST_TIMEOUT_SECONDS = 20
+
+# Dedicated HTTP client (api.py) shared by the coordinators and the config/options flows
+DATA_API_CLIENT = "api_client"
+USER_AGENT = "homeassistant-mateo-meals/1.2.1"
+HTTP_LIMIT_PER_HOST = 8
+HTTP_KEEPALIVE_SECONDS = 30
+HTTP_DNS_CACHE_SECONDS = 300
+HTTP_RETRIES = 2
+HTTP_RETRY_BACKOFF_SECONDS = 0.5
+
+# refresh service: how many schools are refreshed at the same time
+ATTR_MAX_PARALLEL = "max_parallel"
+DEFAULT_REFRESH_MAX_PARALLEL = 4
+MAX_REFRESH_PARALLEL = 32
+
+# get_menu service: date range and meal type / allergen filters (case-insensitive substrings)
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+ATTR_MEAL_TYPES = "meal_types"
+ATTR_EXCLUDE_ALLERGENS = "exclude_allergens"
+MAX_MENU_RANGE_DAYS = 366
+
+# Shared per-municipality coordinators (hass.data[DOMAIN] key)
+DATA_MUNICIPALITIES = "municipalities"
+
+# Negative cache for weeks that 404 or are empty (holidays): retry after an exponential backoff,
+# but never later than the week's own Monday.
+MISSING_WEEK_RETRY_MIN_SECONDS = 6 * 3600
+MISSING_WEEK_RETRY_MAX_SECONDS = 7 * 86400
+
+# Shared districts.json cache (hass.data[DOMAIN] key and freshness window)
+DATA_DISTRICTS_CACHE = "districts_cache"
+DISTRICTS_CACHE_TTL_SECONDS = 3600
+
+# Conditional request validators (ETag / Last-Modified) persisted through HA's Store
+DATA_VALIDATORS = "validators"
+VALIDATORS_STORAGE_KEY = f"{DOMAIN}.validators"
+VALIDATORS_STORAGE_VERSION = 1
+VALIDATORS_MAX_AGE_DAYS = 30
+VALIDATORS_MAX_ENTRIES = 500  # least recently used URLs beyond this are dropped
+
+# Detected week-URL scheme per municipality, persisted and re-checked after a while
+DATA_URL_SCHEMES = "url_schemes"
+URL_SCHEMES_STORAGE_KEY = f"{DOMAIN}.url_schemes"
+URL_SCHEMES_STORAGE_VERSION = 1
+URL_SCHEME_REVALIDATE_DAYS = 7
+
+# Last good menu snapshot per school, used to warm-start entities before the first network refresh
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshot"
+SNAPSHOT_STORAGE_VERSION = 1
+
+# On-disk menu history (SQLite file in the HA config dir) backing calendar range queries
+DATA_ARCHIVE = "archive"
+ARCHIVE_FILENAME = "mateo_meals_archive.db"
+
+# Base sensor menu attributes: kept out of the recorder and bounded to this budget. Whole days
+# are dropped from upcoming_meals once the budget is spent; the calendar has the full menus.
+ATTR_UPCOMING_DAYS = 5  # today + following 4 days
+ATTR_MEAL_NAME_MAX_CHARS = 100
+ATTR_MENU_MAX_CHARS = 1000  # meal name characters across today_meals and upcoming_meals
+
+# Runtime metrics (metrics.py) shown in diagnostics: request latency buckets and tracked URLs
+METRICS_LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+METRICS_MAX_URLS = 500
@@ -1,30 +1,154 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import date, datetime, timedelta, timezone
+from datetime import date, datetime, timedelta
 from typing import Any
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import aiohttp_client
+from homeassistant.const import MAX_LENGTH_STATE_STATE
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import BASE_DISTRICTS, BASE_MENU
+from .api import async_get_api_client
+from .archive import async_get_menu_archive
+from .cache import async_get_districts_cache
+from .client import (
+    SCHEME_ISO_WEEK,
+    MateoApiError,
+    MateoNotFoundError,
+    districts_list,
+    exception_days_by_school,
+    meal_from_name,
+    meal_names,
+    parse_week_meals,
+    week_url,
+)
+from .const import (
+    BASE_DISTRICTS,
+    DATA_MUNICIPALITIES,
+    DEFAULT_DAYS_AHEAD,
+    DEFAULT_HORIZON_WEEKS,
+    DOMAIN,
+    MAX_CONCURRENT_REQUESTS,
+    MAX_DAYS_AHEAD,
+    MAX_HORIZON_WEEKS,
+    MISSING_WEEK_RETRY_MAX_SECONDS,
+    MISSING_WEEK_RETRY_MIN_SECONDS,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from .exception_days import (
+    EMPTY_EXCEPTION_DAYS,
+    ExceptionDayIndex,
+    as_exception_index,
+)
+from .http_cache import async_get_validator_store
+from .metrics import FetchMetrics, RefreshMetrics
+from .schemes import async_get_url_schemes
+from .school_days import SchoolDays
 
+_SNAPSHOT_SAVE_DELAY_SECONDS = 10
 
-def _iso_week_string(d: date) -> str:
-    year, week, _ = d.isocalendar()
-    return f"{year}-W{week:02d}"
 
+def _local_today() -> date:
+    """Today's date in Home Assistant's configured time zone (menus are per local day)."""
+    return datetime.now(dt_util.get_default_time_zone()).date()
 
-def _local_date_from_iso(dt_str: str) -> date | None:
+
+def _compose_data(
+    today: date, meals_by_date: dict[str, list[str]], exception_days: ExceptionDayIndex
+) -> dict[str, Any]:
+    today_str = today.isoformat()
+    return {
+        "today_date": today_str,
+        "today_meals": meals_by_date.get(today_str, []),
+        "meals_by_date": meals_by_date,
+        "exception_days": exception_days,
+    }
+
+
+def truncate_text(text: str, limit: int) -> str:
+    """Cut text to at most limit characters, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+
+def join_meals(names: list[str]) -> str:
+    """Meal names as one state string, within Home Assistant's state length limit."""
+    return truncate_text("; ".join(names), MAX_LENGTH_STATE_STATE)
+
+
+@dataclass(frozen=True, slots=True)
+class DaySlot:
+    """Pre-rendered state of one day sensor offset."""
+
+    date: date
+    state: str | None
+    attributes: dict[str, Any]
+
+
+def _build_day_table(data: dict[str, Any] | None, school_days: SchoolDays) -> tuple[DaySlot, ...]:
+    meals_by_date = (data or {}).get("meals_by_date") or {}
+    slots: list[DaySlot] = []
+    for offset, target in enumerate(school_days.dates):
+        meals = meals_by_date.get(target.isoformat()) or []
+        if not meals:
+            # Provide consistent non-None to avoid 'unknown' for skipped days
+            state: str | None = "No menu"
+        elif isinstance(meals, list):
+            names = [m for m in meals if isinstance(m, str) and m]
+            state = join_meals(names) if names else None
+        else:  # defensive
+            state = None
+        slots.append(
+            DaySlot(
+                date=target,
+                state=state,
+                attributes={
+                    "date": target.isoformat(),
+                    "offset": offset,
+                    "include_weekends": school_days.include_weekends,
+                    "has_meals": bool(meals),
+                },
+            )
+        )
+    return tuple(slots)
+
+
+def _data_today(data: dict[str, Any] | None) -> date:
+    """The day the data was derived for, falling back to the local date."""
     try:
-        # API returns e.g. 2025-09-15T00:00:00.000Z
-        dt = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
-        # Convert to local timezone via Home Assistant core later; here assume UTC date component
-        return dt.date()
-    except Exception:  # noqa: BLE001
-        return None
+        return date.fromisoformat((data or {})["today_date"])
+    except (KeyError, TypeError, ValueError):
+        return _local_today()
+
+
+def min_horizon_weeks(days_ahead: int) -> int:
+    """Menu weeks needed so days_ahead school days are covered from any day of the week.
+
+    The worst case is a Saturday: the current week has no school days left, so the days start
+    on the following Monday and span ceil(days_ahead / 5) further weeks.
+    """
+    return min(MAX_HORIZON_WEEKS, 1 + -(-max(1, days_ahead) // 5))
+
+
+def snapshot_storage_key(slug: str, school_id: int) -> str:
+    return f"{SNAPSHOT_STORAGE_KEY}.{slug}_{school_id}"
+
+
+class MenuNotFound(UpdateFailed):
+    """The object store has no file at this URL (unpublished week, holiday)."""
+
+
+@dataclass(slots=True)
+class _MissingWeek:
+    retry_at: datetime
+    misses: int
 
 
 @dataclass
@@ -35,101 +159,590 @@ class MateoConfig:
     municipality_name: str
 
 
-class MateoMealsCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    def __init__(self, hass: HomeAssistant, cfg: MateoConfig, update_hours: int = 4) -> None:
+class MateoMunicipalityCoordinator(DataUpdateCoordinator[dict[int, dict[str, Any]]]):
+    """Fetches every registered school of one municipality in a single batched refresh.
+
+    districts.json is requested once per refresh and all week files share one bounded
+    fan-out. Results are published per school_id to the attached MateoMealsCoordinator views,
+    so timers and requests scale with municipalities rather than schools.
+    """
+
+    # Set by the base class and changed by async_update_interval.
+    update_interval: timedelta | None
+
+    def __init__(self, hass: HomeAssistant, slug: str, update_hours: int = 4) -> None:
         super().__init__(
             hass,
             logger=logging.getLogger(__name__),
-            name="MateoMealsCoordinator",
+            name=f"MateoMunicipalityCoordinator {slug}",
             update_interval=timedelta(hours=max(1, update_hours)),
+            # A refresh that returns the same menus for every school notifies nobody.
+            always_update=False,
         )
-        self._cfg = cfg
+        self.slug = slug
+        self._views: list[MateoMealsCoordinator] = []
+        self._unsub_rollover: CALLBACK_TYPE | None = None
+        # Weeks that came back missing or empty, per (school_id, monday), with their backoff.
+        self._missing_weeks: dict[tuple[int, date], _MissingWeek] = {}
+        # districts.json payload last indexed and its exception days per school.
+        self._exception_days: tuple[Any, dict[int, ExceptionDayIndex]] | None = None
+        # Parsed week files per (school_id, monday), kept across refreshes: the payload, its
+        # meal names per date and the full meals (type, categories, allergens) per date.
+        self._weeks: dict[
+            tuple[int, date],
+            tuple[Any, dict[str, list[str]], dict[str, list[dict[str, Any]]]],
+        ] = {}
+        # Shared by every request this coordinator issues so a refresh is one bounded fan-out.
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self.metrics = FetchMetrics()
+
+    @property
+    def school_ids(self) -> list[int]:
+        return sorted({view.school_id for view in self._views})
+
+    def register(self, view: MateoMealsCoordinator) -> None:
+        self._views.append(view)
+        self.async_update_interval()
+
+    def unregister(self, view: MateoMealsCoordinator) -> None:
+        if view in self._views:
+            self._views.remove(view)
+        self.async_update_interval()
+
+    @property
+    def has_views(self) -> bool:
+        return bool(self._views)
+
+    @property
+    def next_refresh(self) -> datetime | None:
+        """When the polling timer is due next; None before the first refresh or while idle."""
+        last = self.metrics.update.last_attempt
+        interval: timedelta | None = self.update_interval
+        if last is None or interval is None or not self._listeners:
+            return None
+        return last + interval
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        remove_listener = super().async_add_listener(update_callback, context)
+        # Day rollover runs only while some entity listens, like the polling timer.
+        if self._unsub_rollover is None:
+            self._unsub_rollover = async_track_time_change(
+                self.hass, self._async_handle_rollover, hour=0, minute=0, second=0
+            )
+
+        @callback
+        def _remove() -> None:
+            remove_listener()
+            if not self._listeners and self._unsub_rollover is not None:
+                self._unsub_rollover()
+                self._unsub_rollover = None
+
+        return _remove
+
+    @callback
+    def _async_handle_rollover(self, now: datetime) -> None:
+        """Re-derive today-dependent state at local midnight from cached data (no network)."""
+        today = now.date()
+        for view in list(self._views):
+            view.async_roll_over(today)
+
+    @callback
+    def async_update_interval(self) -> bool:
+        """Poll as often as the most demanding attached entry asks for; True if it changed."""
+        if not self._views:
+            return False
+        hours = max(1, min(view.update_hours for view in self._views))
+        interval = timedelta(hours=hours)
+        if self.update_interval == interval:
+            return False
+        self.update_interval = interval
+        return True
 
     async def _async_fetch_json(self, url: str) -> Any:
-        session = aiohttp_client.async_get_clientsession(self.hass)
-        headers = {"User-Agent": "homeassistant-mateo-meals/1.1.0"}
-        async with session.get(url, timeout=20, headers=headers) as resp:
-            if resp.status != 200:
-                text = await resp.text()
-                raise UpdateFailed(f"HTTP {resp.status} for {url} body={text[:120]}")
-            return await resp.json(content_type=None)
-
-    async def _async_get_exception_days(self) -> list[dict[str, Any]]:  # noqa: D401 (internal helper)
-        url = BASE_DISTRICTS.format(slug=self._cfg.slug)
+        client = async_get_api_client(self.hass)
+        validators = await async_get_validator_store(self.hass)
         try:
-            payload = await self._async_fetch_json(url)
-        except Exception:  # noqa: BLE001
-            return []
-        districts = payload.get("districts", []) if isinstance(payload, dict) else []
-        exc: list[dict[str, Any]] = []
-        for d in districts:
-            for ex in d.get("districts_exception_days", []) or []:
-                start = ex.get("start")
-                end = ex.get("end")
-                if start:
-                    sdt = _local_date_from_iso(start)
-                    ex["start"] = sdt.isoformat() if sdt else start
-                if end:
-                    edt = _local_date_from_iso(end)
-                    ex["end"] = edt.isoformat() if edt else end
-                exc.append(ex)
-        return exc
+            return await client.async_get_json(url, validators, self.metrics)
+        except MateoNotFoundError as err:
+            raise MenuNotFound(str(err)) from err
+        except MateoApiError as err:
+            raise UpdateFailed(str(err)) from err
+
+    async def _async_fetch_bounded(self, url: str) -> Any:
+        """Fetch one URL under the shared concurrency limit (the client bounds each attempt)."""
+        async with self._request_semaphore:
+            return await self._async_fetch_json(url)
+
+    async def _async_fetch_week(self, school_id: int, monday: date) -> Any | None:
+        """Fetch one week payload using the municipality's URL scheme, trying the other on failure.
+
+        Returns None for a week known to be missing (404 or empty) until its retry time.
+        """
+        key = (school_id, monday)
+        missing = self._missing_weeks.get(key)
+        skip = missing is not None and dt_util.utcnow() < missing.retry_at
+        self.metrics.missing_weeks.record(skip)
+        if skip:
+            return None
+        schemes = await async_get_url_schemes(self.hass)
+        payload: Any = None
+        errors: list[Exception] = []
+        for attempt, scheme in enumerate(schemes.order(self.slug)):
+            if attempt:
+                self.metrics.scheme_fallbacks += 1
+            url = week_url(self.slug, school_id, monday, scheme)
+            try:
+                payload = await self._async_fetch_bounded(url)
+            except Exception as err:  # noqa: BLE001
+                errors.append(err)
+                continue
+            if payload:
+                # Only real menus prove a scheme; empty lists are served for either.
+                schemes.remember(self.slug, scheme)
+                self.metrics.week_sizes[key] = self.metrics.payload_size(url)
+                if scheme == SCHEME_ISO_WEEK:
+                    self.metrics.legacy_scheme_weeks += 1
+            break
+        else:
+            # Missing under every scheme is an empty week; anything else is a real failure.
+            if not all(isinstance(err, MenuNotFound) for err in errors):
+                raise UpdateFailed(str(errors[0])) from errors[0]
+        if not payload:
+            self.metrics.week_sizes.pop(key, None)
+            self._remember_missing_week(key, missing)
+            return None
+        self._missing_weeks.pop(key, None)
+        return payload
+
+    def _remember_missing_week(
+        self, key: tuple[int, date], previous: _MissingWeek | None
+    ) -> None:
+        misses = previous.misses + 1 if previous else 1
+        backoff = min(
+            MISSING_WEEK_RETRY_MIN_SECONDS * 2 ** (misses - 1), MISSING_WEEK_RETRY_MAX_SECONDS
+        )
+        retry_at = dt_util.utcnow() + timedelta(seconds=backoff)
+        # A future week is worth asking for again as soon as it becomes the current week.
+        week_start = dt_util.start_of_local_day(key[1])
+        if week_start > dt_util.utcnow():
+            retry_at = min(retry_at, week_start)
+        self._missing_weeks[key] = _MissingWeek(retry_at=retry_at, misses=misses)
+
+    @callback
+    def async_forget_missing_weeks(self, school_id: int | None = None) -> None:
+        """Drop negative cache entries (manual refresh) so those weeks are requested again."""
+        for key in [k for k in self._missing_weeks if school_id is None or k[0] == school_id]:
+            del self._missing_weeks[key]
+
+    async def _async_get_exception_days(self) -> dict[int, ExceptionDayIndex]:
+        """Exception-day index per school of this municipality, rebuilt only for new payloads."""
+        url = BASE_DISTRICTS.format(slug=self.slug)
+        cache = async_get_districts_cache(self.hass)
+        downloaded = False
+
+        async def _async_download() -> Any:
+            nonlocal downloaded
+            downloaded = True
+            return await self._async_fetch_bounded(url)
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        # Current and next week (simple week numbers used in filename pattern school_week.json)
-        # Compatibility: Python <3.11 uses timezone.utc; 3.11+ offers datetime.UTC alias.
         try:
-            utc = datetime.UTC  # type: ignore[attr-defined]
-        except AttributeError:  # pragma: no cover - older runtime
-            utc = timezone.utc
-        now = datetime.now(utc).date()
-        weekday = now.weekday()  # Mon=0
-        monday = now - timedelta(days=weekday)
-        next_monday = monday + timedelta(days=7)
-        _year, week_cur, _ = monday.isocalendar()
-        _year_next, week_next, _ = next_monday.isocalendar()
-        week_numbers = (week_cur, week_next)
-        urls = [
-            BASE_MENU.format(slug=self._cfg.slug, school_id=self._cfg.school_id, weeknum=w)
-            for w in week_numbers
+            payload = await cache.async_get(self.slug, _async_download)
+        except Exception as err:  # noqa: BLE001
+            # Exception days change rarely; keep the last known index rather than
+            # serving study days and breaks as school days until the next refresh.
+            self.logger.debug("Mateo districts unavailable for %s: %s", self.slug, err)
+            return self._exception_days[1] if self._exception_days is not None else {}
+        finally:
+            self.metrics.districts_cache.record(not downloaded)
+        cached = self._exception_days
+        if cached is None or cached[0] is not payload:
+            # The payload is shared with other entries through the cache; the parser copies.
+            started = time.perf_counter()
+            by_school = exception_days_by_school(districts_list(payload))
+            cached = self._exception_days = (
+                payload,
+                {sid: ExceptionDayIndex.from_days(days) for sid, days in by_school.items()},
+            )
+            self.metrics.districts_parse.record(time.perf_counter() - started)
+        return cached[1]
+
+    def horizon_weeks(self, school_id: int) -> int:
+        """Weeks to keep for a school: the widest horizon among its entries."""
+        return max(
+            (view.horizon_weeks for view in self._views if view.school_id == school_id),
+            default=DEFAULT_HORIZON_WEEKS,
+        )
+
+    def _parse_week(self, school_id: int, monday: date, payload: Any) -> dict[str, list[str]]:
+        # A 304 hands back the very payload object parsed last time; reuse that result.
+        key = (school_id, monday)
+        cached = self._weeks.get(key)
+        if cached is not None and cached[0] is payload:
+            self.metrics.parsed_weeks.record(True)
+            return cached[1]
+        self.metrics.parsed_weeks.record(False)
+        started = time.perf_counter()
+        meals = parse_week_meals([payload])
+        parsed = meal_names(meals)
+        self.metrics.week_parse.record(time.perf_counter() - started)
+        self._weeks[key] = (payload, parsed, meals)
+        return parsed
+
+    def school_meals(
+        self, school_id: int, meals_by_date: dict[str, list[str]]
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Full meals (type, categories, allergens) for the days of a school's meals_by_date.
+
+        Days whose week file is not parsed here (e.g. restored from a snapshot) are known by
+        name only.
+        """
+        parsed: dict[str, list[dict[str, Any]]] = {}
+        for (sid, _), (_, _, meals) in self._weeks.items():
+            if sid == school_id:
+                parsed.update(meals)
+        return {
+            day: parsed.get(day) or [meal_from_name(name) for name in names]
+            for day, names in meals_by_date.items()
+        }
+
+    async def _async_fetch_meals(self, school_id: int, today: date) -> dict[str, list[str]]:
+        # Rolling horizon of week files (school_week.json) starting with the current week.
+        first_monday = today - timedelta(days=today.weekday())
+        mondays = [
+            first_monday + timedelta(weeks=i) for i in range(self.horizon_weeks(school_id))
         ]
-        try:
-            payloads = [await self._async_fetch_json(u) for u in urls]
-        except Exception as primary_err:  # noqa: BLE001
-            try:
-                legacy_urls = [
-                    f"https://objects.dc-fbg1.glesys.net/mateo.{self._cfg.slug}/menus/app/{self._cfg.school_id}_{_iso_week_string(monday)}.json",
-                    f"https://objects.dc-fbg1.glesys.net/mateo.{self._cfg.slug}/menus/app/{self._cfg.school_id}_{_iso_week_string(next_monday)}.json",
-                ]
-                payloads = [await self._async_fetch_json(u) for u in legacy_urls]
-            except Exception:  # noqa: BLE001
-                raise UpdateFailed(str(primary_err)) from primary_err
-        week_maps: list[dict[str, list[dict[str, Any]]]] = []
-        for payload in payloads:
-            daymap: dict[str, list[dict[str, Any]]] = {}
-            if isinstance(payload, list):
-                for day in payload:
-                    dts = day.get("date")
-                    d_local = _local_date_from_iso(dts) if dts else None
-                    if not d_local or d_local.weekday() > 4:
-                        continue
-                    meals = day.get("meals") or []
-                    if meals:
-                        daymap[d_local.isoformat()] = meals
-            week_maps.append(daymap)
-        today_str = now.isoformat()
+        payloads = await asyncio.gather(
+            *(self._async_fetch_week(school_id, m) for m in mondays), return_exceptions=True
+        )
+        errors = [p for p in payloads if isinstance(p, BaseException)]
+        if len(errors) == len(payloads):
+            raise errors[0]
+        # Weeks that scrolled out of the horizon are history now (see the archive).
+        for weeks in (self._weeks, self.metrics.week_sizes):
+            for key in [k for k in weeks if k[0] == school_id and k[1] not in mondays]:
+                del weeks[key]
+        for key in [k for k in self._missing_weeks if k[0] == school_id and k[1] < first_monday]:
+            del self._missing_weeks[key]
         meals_by_date: dict[str, list[str]] = {}
-        for wm in week_maps:
-            for d, meals in wm.items():
-                names_raw = [m.get("name") for m in meals if isinstance(m, dict) and m.get("name")]
-                names = [n.strip() for n in names_raw if isinstance(n, str) and n.strip()]
-                if names:
-                    meals_by_date[d] = names
-        meal_names_today = meals_by_date.get(today_str, [])
-        exception_days = await self._async_get_exception_days()
-        return {
-            "today_date": today_str,
-            "today_meals": meal_names_today,
-            "meals_by_date": meals_by_date,
-            "exception_days": exception_days,
+        for monday, payload in zip(mondays, payloads, strict=True):
+            if isinstance(payload, BaseException):
+                # Far weeks are often not published yet; keep the ones we have.
+                self.logger.debug(
+                    "Week %s unavailable for %s/%s: %s", monday, self.slug, school_id, payload
+                )
+                continue
+            if payload is None:
+                # Holiday or not yet published: an empty week, not an error.
+                continue
+            meals_by_date.update(self._parse_week(school_id, monday, payload))
+        return meals_by_date
+
+    async def _async_archive(self, schools: dict[int, dict[str, list[str]]]) -> None:
+        """Store the schools' menus (full meals, see school_meals) in the archive."""
+        meals = {sid: self.school_meals(sid, by_date) for sid, by_date in schools.items()}
+        try:
+            await async_get_menu_archive(self.hass).async_store(self.slug, meals)
+        except Exception as err:  # noqa: BLE001
+            # History is best effort; never fail a refresh because of it.
+            self.logger.warning("Could not archive Mateo menus for %s: %s", self.slug, err)
+
+    async def async_fetch_school(self, school_id: int) -> dict[str, Any]:
+        """Fetch one school's slice (weeks and exception days in one concurrent fan-out)."""
+        today = _local_today()
+        meals_by_date, exception_days = await asyncio.gather(
+            self._async_fetch_meals(school_id, today),
+            self._async_get_exception_days(),
+        )
+        await self._async_archive({school_id: meals_by_date})
+        return _compose_data(
+            today, meals_by_date, exception_days.get(school_id, EMPTY_EXCEPTION_DAYS)
+        )
+
+    async def _async_update_data(self) -> dict[int, dict[str, Any]]:
+        started = time.monotonic()
+        outcomes: dict[int, bool] = {}
+        slices: dict[int, dict[str, Any]] | None = None
+        try:
+            slices = await self._async_update_schools(outcomes)
+            return slices
+        finally:
+            duration = time.monotonic() - started
+            now = dt_util.utcnow()
+            self.metrics.update.record(duration, slices is not None, now)
+            for view in list(self._views):
+                view.metrics.record(duration, outcomes.get(view.school_id, False), now)
+                view.async_update_metrics_listeners()
+
+    async def _async_update_schools(self, outcomes: dict[int, bool]) -> dict[int, dict[str, Any]]:
+        """Fetch every registered school; outcomes receives success per school_id."""
+        today = _local_today()
+        school_ids = self.school_ids
+        # The exception-day helper never raises (it falls back to the last known index), so
+        # only the per-school fetches collect exceptions.
+        exception_days, results = await asyncio.gather(
+            self._async_get_exception_days(),
+            asyncio.gather(
+                *(self._async_fetch_meals(sid, today) for sid in school_ids),
+                return_exceptions=True,
+            ),
+        )
+        previous = self.data or {}
+        fresh: dict[int, dict[str, Any]] = {}
+        errors: list[BaseException] = []
+        for sid, result in zip(school_ids, results, strict=True):
+            if isinstance(result, BaseException):
+                self.logger.debug("Mateo fetch failed for %s/%s: %s", self.slug, sid, result)
+                outcomes[sid] = False
+                errors.append(result)
+                continue
+            outcomes[sid] = True
+            fresh[sid] = _compose_data(
+                today, result, exception_days.get(sid, EMPTY_EXCEPTION_DAYS)
+            )
+        if school_ids and not fresh:
+            raise UpdateFailed(str(errors[0])) from errors[0]
+        await self._async_archive({sid: data["meals_by_date"] for sid, data in fresh.items()})
+        # A failing school keeps its previous slice (its view stays available and unchanged);
+        # the others still update.
+        slices = {sid: previous[sid] for sid in school_ids if sid in previous}
+        slices.update(fresh)
+        return slices
+
+
+def async_get_municipality_coordinator(
+    hass: HomeAssistant, slug: str, update_hours: int = 4
+) -> MateoMunicipalityCoordinator:
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    municipalities: dict[str, MateoMunicipalityCoordinator] = domain_data.setdefault(
+        DATA_MUNICIPALITIES, {}
+    )
+    coordinator = municipalities.get(slug)
+    if coordinator is None:
+        coordinator = municipalities[slug] = MateoMunicipalityCoordinator(hass, slug, update_hours)
+    return coordinator
+
+
+class MateoMealsCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Per-entry view onto one school's slice of a MateoMunicipalityCoordinator.
+
+    Views have no timer of their own. They subscribe to the municipality while entities listen
+    to them and refresh requests are forwarded (and thereby batched) to the municipality.
+    Constructed without a municipality, a view gets a private one (standalone use and tests).
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        cfg: MateoConfig,
+        update_hours: int = 4,
+        municipality: MateoMunicipalityCoordinator | None = None,
+        horizon_weeks: int = DEFAULT_HORIZON_WEEKS,
+        days_ahead: int = DEFAULT_DAYS_AHEAD,
+    ) -> None:
+        super().__init__(
+            hass,
+            logger=logging.getLogger(__name__),
+            name="MateoMealsCoordinator",
+            update_interval=None,
+            always_update=False,
+        )
+        self._cfg = cfg
+        self.update_hours = max(1, update_hours)
+        # Never fewer weeks than the day sensors need, or the far ones show "No menu".
+        self.horizon_weeks = max(1, horizon_weeks, min_horizon_weeks(days_ahead))
+        self.municipality = municipality or MateoMunicipalityCoordinator(
+            hass, cfg.slug, update_hours
+        )
+        self.municipality.register(self)
+        self._unsub_municipality: CALLBACK_TYPE | None = None
+        self._school_days: dict[bool, tuple[Any, SchoolDays]] = {}
+        self._day_tables: dict[bool, tuple[Any, tuple[DaySlot, ...]]] = {}
+        # Refreshes that produced this school's data (batched or through async_refresh).
+        self.metrics = RefreshMetrics()
+        self._metrics_listeners: list[CALLBACK_TYPE] = []
+        self._snapshot: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, snapshot_storage_key(cfg.slug, cfg.school_id)
+        )
+
+    @property
+    def school_id(self) -> int:
+        return self._cfg.school_id
+
+    def school_days(self, include_weekends: bool) -> SchoolDays:
+        """School-day calendar from today for the current data, built once per data update."""
+        cached = self._school_days.get(include_weekends)
+        if cached is None or cached[0] is not self.data:
+            data = self.data or {}
+            school_days = SchoolDays.build(
+                _data_today(self.data),
+                data.get("meals_by_date") or {},
+                as_exception_index(data.get("exception_days")),
+                include_weekends,
+                MAX_DAYS_AHEAD,
+            )
+            cached = self._school_days[include_weekends] = (self.data, school_days)
+        return cached[1]
+
+    def day_slot(self, offset: int, include_weekends: bool) -> DaySlot:
+        """Return the pre-rendered slot for a day offset.
+
+        The table for every offset is built once per data update (including the midnight
+        rollover), so day sensors read their state in constant time.
+        """
+        cached = self._day_tables.get(include_weekends)
+        if cached is None or cached[0] is not self.data:
+            table = _build_day_table(self.data, self.school_days(include_weekends))
+            cached = self._day_tables[include_weekends] = (self.data, table)
+        return cached[1][offset]
+
+    async def async_menu_range(self, start: date, end: date) -> dict[str, list[dict[str, Any]]]:
+        """Meals (see client.parse_week_meals) for start..end (inclusive), sorted by date.
+
+        Days covered by the current weeks come from memory; earlier days (or the whole range
+        before the first refresh) come from the on-disk archive.
+        """
+        meals_by_date = (self.data or {}).get("meals_by_date") or {}
+        first_key = min(meals_by_date) if meals_by_date else None
+        menus: dict[str, list[dict[str, Any]]] = {}
+        if first_key is None or start.isoformat() < first_key:
+            history_end = end if first_key is None else min(
+                end, date.fromisoformat(first_key) - timedelta(days=1)
+            )
+            menus.update(
+                await async_get_menu_archive(self.hass).async_range_meals(
+                    self._cfg.slug, self._cfg.school_id, start, history_end
+                )
+            )
+        start_key, end_key = start.isoformat(), end.isoformat()
+        current = {
+            key: names
+            for key, names in meals_by_date.items()
+            if start_key <= key <= end_key and names
         }
+        menus.update(self.municipality.school_meals(self.school_id, current))
+        return dict(sorted(menus.items()))
+
+    @property
+    def payload_bytes(self) -> int:
+        """Body size of the week files behind this school's current menus."""
+        return self.municipality.metrics.school_payload_bytes(self.school_id)
+
+    @callback
+    def async_add_metrics_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Call update_callback after every refresh attempt, even one that changed no data."""
+        self._metrics_listeners.append(update_callback)
+
+        @callback
+        def _remove() -> None:
+            if update_callback in self._metrics_listeners:
+                self._metrics_listeners.remove(update_callback)
+
+        return _remove
+
+    @callback
+    def async_update_metrics_listeners(self) -> None:
+        for update_callback in list(self._metrics_listeners):
+            update_callback()
+
+    @callback
+    def async_roll_over(self, today: date) -> None:
+        """Move today_date/today_meals (and the day table) to a new day using cached menus."""
+        data = self.data
+        if not data or data.get("today_date") == today.isoformat():
+            return
+        self.async_set_updated_data(
+            _compose_data(
+                today,
+                data.get("meals_by_date") or {},
+                as_exception_index(data.get("exception_days")),
+            )
+        )
+
+    async def async_load_snapshot(self) -> bool:
+        """Seed data from the last successful refresh on disk; return True if one was found."""
+        try:
+            stored = await self._snapshot.async_load()
+        except Exception as err:  # noqa: BLE001
+            self.logger.debug("Ignoring unreadable menu snapshot: %s", err)
+            return False
+        if not isinstance(stored, dict) or not isinstance(stored.get("meals_by_date"), dict):
+            return False
+        # today_date/today_meals are derived again so a snapshot from yesterday is not stale.
+        self.data = _compose_data(
+            _local_today(),
+            stored["meals_by_date"],
+            as_exception_index(stored.get("exception_days")),
+        )
+        return True
+
+    def _schedule_snapshot_save(self, data: dict[str, Any]) -> None:
+        snapshot = {
+            "meals_by_date": data["meals_by_date"],
+            "exception_days": as_exception_index(data.get("exception_days")).as_list(),
+        }
+        self._snapshot.async_delay_save(lambda: snapshot, _SNAPSHOT_SAVE_DELAY_SECONDS)
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        remove_listener = super().async_add_listener(update_callback, context)
+        if self._unsub_municipality is None:
+            self._unsub_municipality = self.municipality.async_add_listener(
+                self._handle_municipality_update
+            )
+            # Pick up a batch that completed before this view had listeners.
+            current = (self.municipality.data or {}).get(self.school_id)
+            if current is not None:
+                self.data = current
+
+        @callback
+        def _remove() -> None:
+            remove_listener()
+            if not self._listeners and self._unsub_municipality is not None:
+                self._unsub_municipality()
+                self._unsub_municipality = None
+
+        return _remove
+
+    @callback
+    def _handle_municipality_update(self) -> None:
+        if not self.municipality.last_update_success:
+            err = self.municipality.last_exception
+            self.async_set_update_error(err if isinstance(err, Exception) else UpdateFailed())
+            return
+        data = (self.municipality.data or {}).get(self.school_id)
+        if data is None:
+            return
+        if self.last_update_success and data == self.data:
+            # Another school of the municipality changed; this one renders the same as before.
+            return
+        self._schedule_snapshot_save(data)
+        self.async_set_updated_data(data)
+
+    async def async_request_refresh(self) -> None:
+        # Forward to the municipality so simultaneous requests collapse into one batched fetch.
+        await self.municipality.async_request_refresh()
+
+    @callback
+    def async_detach(self) -> None:
+        """Stop receiving municipality updates and leave its batch (entry unload)."""
+        if self._unsub_municipality is not None:
+            self._unsub_municipality()
+            self._unsub_municipality = None
+        self.municipality.unregister(self)
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        started = time.monotonic()
+        success = False
+        try:
+            data = await self.municipality.async_fetch_school(self.school_id)
+            success = True
+        finally:
+            self.metrics.record(time.monotonic() - started, success, dt_util.utcnow())
+            self.async_update_metrics_listeners()
+        self._schedule_snapshot_save(data)
+        return data
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import COORDINATORS
+from .const import DATA_MUNICIPALITIES, DOMAIN
+from .coordinator import MateoMunicipalityCoordinator
+
+
+def _municipality_summary(coord: MateoMunicipalityCoordinator) -> dict[str, Any]:
+    metrics = coord.metrics
+    return {
+        "schools": coord.school_ids,
+        "requests": sum(metrics.statuses.values()),
+        "bytes_received": metrics.bytes_received,
+        "last_update_ms": metrics.update.last_duration_ms,
+        "mean_update_ms": metrics.update.duration.as_dict()["mean_ms"],
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Entry configuration, this school's refreshes and its municipality's fetch counters.
+
+    Counters start at zero when Home Assistant starts. "municipalities" compares request
+    volume and refresh latency across every municipality with a loaded entry.
+    """
+    diagnostics: dict[str, Any] = {
+        "entry": {"data": dict(entry.data), "options": dict(entry.options)},
+    }
+    coord = COORDINATORS.get(entry.entry_id)
+    if coord is not None:
+        data = coord.data or {}
+        municipality = coord.municipality
+        diagnostics["school"] = {
+            "slug": municipality.slug,
+            "school_id": coord.school_id,
+            "last_update_success": coord.last_update_success,
+            "today_date": data.get("today_date"),
+            "menu_days": len(data.get("meals_by_date") or {}),
+            "exception_days": len(data.get("exception_days") or []),
+            "payload_bytes": coord.payload_bytes,
+            "refresh": coord.metrics.as_dict(),
+        }
+        diagnostics["municipality"] = {
+            "slug": municipality.slug,
+            "update_interval_seconds": (
+                municipality.update_interval.total_seconds()
+                if municipality.update_interval
+                else None
+            ),
+            "last_update_success": municipality.last_update_success,
+            "schools": municipality.school_ids,
+            **municipality.metrics.as_dict(),
+        }
+    municipalities: dict[str, MateoMunicipalityCoordinator] = hass.data.get(DOMAIN, {}).get(
+        DATA_MUNICIPALITIES, {}
+    )
+    diagnostics["municipalities"] = {
+        slug: _municipality_summary(municipality)
+        for slug, municipality in sorted(municipalities.items())
+    }
+    return diagnostics
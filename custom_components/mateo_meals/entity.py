@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import MateoMealsCoordinator
+
+
+class MateoCoordinatorEntity(CoordinatorEntity[MateoMealsCoordinator], ABC):
+    """Coordinator entity that writes its state only when what it renders has changed.
+
+    A refresh of a municipality notifies every entity of every school; most of them render
+    exactly what they wrote last time. Skipping those writes saves the state machine and the
+    event bus a state_reported event per entity and refresh.
+    """
+
+    _last_rendered: tuple[Any, ...] | None = None
+
+    @abstractmethod
+    def _rendered(self) -> tuple[Any, ...]:
+        """Everything that ends up in the written state (value and attributes)."""
+
+    def _rendered_with_availability(self) -> tuple[Any, ...]:
+        return (self.available, *self._rendered())
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # The platform writes the initial state right after this.
+        self._last_rendered = self._rendered_with_availability()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        rendered = self._rendered_with_availability()
+        if rendered == self._last_rendered:
+            return
+        self._last_rendered = rendered
+        self.async_write_ha_state()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+
+def _as_date(value: Any) -> date | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class ExceptionDayIndex:
+    """One school's exception days (study days, breaks) as sorted, disjoint date intervals.
+
+    Overlapping or adjacent entries are merged, so "is this an exception day?" is one bisect
+    over the interval starts. The parsed source entries are kept for snapshots.
+    """
+
+    starts: tuple[date, ...] = ()
+    ends: tuple[date, ...] = ()
+    names: tuple[str | None, ...] = ()
+    entries: tuple[dict[str, Any], ...] = ()
+
+    @classmethod
+    def from_days(cls, days: Iterable[dict[str, Any]] | None) -> ExceptionDayIndex:
+        """Build from parsed exception days ({"name", "start", "end"} with ISO dates)."""
+        entries: list[dict[str, Any]] = []
+        spans: list[tuple[date, date, str | None]] = []
+        for entry in days or ():
+            if not isinstance(entry, dict):
+                continue
+            start = _as_date(entry.get("start"))
+            if start is None:
+                continue
+            end = _as_date(entry.get("end")) or start
+            if end < start:
+                start, end = end, start
+            entries.append(entry)
+            spans.append((start, end, entry.get("name") or None))
+        spans.sort(key=lambda span: span[0])
+        merged: list[tuple[date, date, list[str]]] = []
+        for start, end, name in spans:
+            if merged and start.toordinal() <= merged[-1][1].toordinal() + 1:
+                prev_start, prev_end, names = merged[-1]
+                merged[-1] = (prev_start, max(prev_end, end), names)
+            else:
+                names = []
+                merged.append((start, end, names))
+            if name and name not in names:
+                names.append(name)
+        return cls(
+            starts=tuple(span[0] for span in merged),
+            ends=tuple(span[1] for span in merged),
+            names=tuple("; ".join(span[2]) or None for span in merged),
+            entries=tuple(entries),
+        )
+
+    def _position(self, day: date) -> int | None:
+        pos = bisect_right(self.starts, day) - 1
+        if pos >= 0 and day <= self.ends[pos]:
+            return pos
+        return None
+
+    def __contains__(self, day: object) -> bool:
+        return isinstance(day, date) and self._position(day) is not None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def name_at(self, day: date) -> str | None:
+        """Name of the exception covering day; None if it is a regular day or unnamed."""
+        pos = self._position(day)
+        return self.names[pos] if pos is not None else None
+
+    def as_list(self) -> list[dict[str, Any]]:
+        return [dict(entry) for entry in self.entries]
+
+
+EMPTY_EXCEPTION_DAYS = ExceptionDayIndex()
+
+
+def as_exception_index(value: Any) -> ExceptionDayIndex:
+    """Accept an index or a list of parsed exception days (snapshots, older data)."""
+    if isinstance(value, ExceptionDayIndex):
+        return value
+    return ExceptionDayIndex.from_days(value) if value else EMPTY_EXCEPTION_DAYS
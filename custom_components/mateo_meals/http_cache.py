@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DATA_VALIDATORS,
+    DOMAIN,
+    VALIDATORS_MAX_AGE_DAYS,
+    VALIDATORS_MAX_ENTRIES,
+    VALIDATORS_STORAGE_KEY,
+    VALIDATORS_STORAGE_VERSION,
+)
+
+_SAVE_DELAY_SECONDS = 30
+
+
+class ValidatorStore:
+    """ETag / Last-Modified validators and the parsed payload they belong to, per URL.
+
+    Entries are persisted so conditional requests keep working across restarts. URLs
+    that have not been seen for VALIDATORS_MAX_AGE_DAYS are dropped, and at most
+    VALIDATORS_MAX_ENTRIES of the most recently used URLs are kept, so the storage file
+    stays bounded while week files come and go.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, VALIDATORS_STORAGE_VERSION, VALIDATORS_STORAGE_KEY
+        )
+        self._entries: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load() or {}
+        self._entries = {
+            url: entry
+            for url, entry in (stored.get("entries") or {}).items()
+            if isinstance(entry, dict)
+        }
+        self._prune()
+
+    def _prune(self) -> bool:
+        """Drop expired entries and the least recently used ones over the cap; True if any."""
+        cutoff = time.time() - VALIDATORS_MAX_AGE_DAYS * 86400
+        keep = sorted(
+            (
+                (entry.get("seen", 0), url)
+                for url, entry in self._entries.items()
+                if entry.get("seen", 0) >= cutoff
+            ),
+            reverse=True,
+        )[:VALIDATORS_MAX_ENTRIES]
+        if len(keep) == len(self._entries):
+            return False
+        kept = {url for _, url in keep}
+        self._entries = {url: entry for url, entry in self._entries.items() if url in kept}
+        return True
+
+    def request_headers(self, url: str) -> dict[str, str]:
+        """Conditional headers for url; empty unless a payload is available to reuse on 304."""
+        entry = self._entries.get(url)
+        if not entry or "payload" not in entry:
+            return {}
+        headers: dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def payload(self, url: str) -> Any:
+        """Return the payload stored for url (marking it as recently used) or None."""
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        entry["seen"] = time.time()
+        return entry.get("payload")
+
+    def remember(self, url: str, etag: str | None, last_modified: str | None, payload: Any) -> None:
+        if not etag and not last_modified:
+            # Nothing to validate against later; don't keep the payload around.
+            self.forget(url)
+            return
+        self._entries[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "payload": payload,
+            "seen": time.time(),
+        }
+        if len(self._entries) > VALIDATORS_MAX_ENTRIES:
+            self._prune()
+        self._schedule_save()
+
+    def forget(self, url: str) -> None:
+        """Drop url's validators, e.g. after a 304 for a payload that is no longer stored."""
+        if self._entries.pop(url, None) is not None:
+            self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, _SAVE_DELAY_SECONDS)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"entries": self._entries}
+
+
+async def _async_load_validator_store(hass: HomeAssistant) -> ValidatorStore:
+    validators = ValidatorStore(hass)
+    await validators.async_load()
+    return validators
+
+
+async def async_get_validator_store(hass: HomeAssistant) -> ValidatorStore:
+    """Return the shared validator store, loading it from disk once on first use."""
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    task: asyncio.Task[ValidatorStore] | None = domain_data.get(DATA_VALIDATORS)
+    if task is None:
+        task = domain_data[DATA_VALIDATORS] = hass.async_create_task(
+            _async_load_validator_store(hass)
+        )
+    try:
+        return await asyncio.shield(task)
+    except Exception:
+        domain_data.pop(DATA_VALIDATORS, None)
+        raise
@@ -0,0 +1,219 @@
+"""Runtime counters for the fetch layer and the coordinators.
+
+Plain data structures without Home Assistant dependencies. The municipality coordinator owns
+a FetchMetrics (requests, caches, parsing, batch refreshes) and each per-school view a
+RefreshMetrics; diagnostics.py and the metric sensors read them.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any
+
+from .const import METRICS_LATENCY_BUCKETS_MS, METRICS_MAX_URLS
+
+
+@dataclass(slots=True)
+class Histogram:
+    """Counts of observations per upper bucket bound (the last bucket is unbounded)."""
+
+    bounds: tuple[float, ...] = METRICS_LATENCY_BUCKETS_MS
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        pos = next((i for i, bound in enumerate(self.bounds) if value <= bound), len(self.bounds))
+        self.counts[pos] += 1
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    def as_dict(self) -> dict[str, Any]:
+        labels = [f"le_{bound:g}" for bound in self.bounds] + ["inf"]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "max": round(self.maximum, 3),
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+        }
+
+
+@dataclass(slots=True)
+class Timer:
+    """Call count and accumulated/longest duration of one operation, in milliseconds."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+@dataclass(slots=True)
+class CacheCounter:
+    hits: int = 0
+    misses: int = 0
+
+    def record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+@dataclass(slots=True)
+class UrlMetrics:
+    latency_ms: Histogram = field(default_factory=Histogram)
+    statuses: Counter[str] = field(default_factory=Counter)
+    bytes_received: int = 0
+    last_size: int = 0  # body size of the last 200; a 304 reuses that payload
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "latency_ms": self.latency_ms.as_dict(),
+            "statuses": dict(self.statuses),
+            "bytes_received": self.bytes_received,
+            "last_size": self.last_size,
+        }
+
+
+@dataclass(slots=True)
+class RefreshMetrics:
+    """Outcome and duration of the refreshes that produced one coordinator's data."""
+
+    duration: Timer = field(default_factory=Timer)
+    failures: int = 0
+    consecutive_failures: int = 0
+    last_duration_ms: float | None = None
+    last_attempt: datetime | None = None
+    last_success: datetime | None = None
+
+    def record(self, seconds: float, success: bool, now: datetime) -> None:
+        self.duration.record(seconds)
+        self.last_duration_ms = round(seconds * 1000, 3)
+        self.last_attempt = now
+        if success:
+            self.consecutive_failures = 0
+            self.last_success = now
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "duration": self.duration.as_dict(),
+            "last_duration_ms": self.last_duration_ms,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_attempt": self.last_attempt.isoformat() if self.last_attempt else None,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+        }
+
+
+class FetchMetrics:
+    """Counters of one municipality's fetch layer; also the client's request observer.
+
+    Per-URL statistics are kept for the most recently requested METRICS_MAX_URLS URLs, so
+    week files that scrolled out of every horizon eventually drop out.
+    """
+
+    def __init__(self) -> None:
+        self.urls: dict[str, UrlMetrics] = {}
+        self.statuses: Counter[str] = Counter()
+        self.bytes_received = 0
+        self.json_decode = Timer()
+        self.week_parse = Timer()
+        self.districts_parse = Timer()
+        self.update = RefreshMetrics()
+        # Weeks served by the legacy ISO-week file name, and lookups that needed a second scheme.
+        self.legacy_scheme_weeks = 0
+        self.scheme_fallbacks = 0
+        self.districts_cache = CacheCounter()
+        self.parsed_weeks = CacheCounter()
+        self.missing_weeks = CacheCounter()
+        # Body size of the week files making up each school's current data.
+        self.week_sizes: dict[tuple[int, date], int] = {}
+
+    def request_finished(
+        self,
+        url: str,
+        status: int | None,
+        seconds: float,
+        size: int,
+        decode_seconds: float | None,
+    ) -> None:
+        stats = self.urls.pop(url, None) or UrlMetrics()
+        self.urls[url] = stats  # most recent last
+        if len(self.urls) > METRICS_MAX_URLS:
+            del self.urls[next(iter(self.urls))]
+        label = "error" if status is None else str(status)
+        stats.latency_ms.observe(seconds * 1000)
+        stats.statuses[label] += 1
+        self.statuses[label] += 1
+        if status == 200:
+            stats.bytes_received += size
+            stats.last_size = size
+            self.bytes_received += size
+        if decode_seconds is not None:
+            self.json_decode.record(decode_seconds)
+
+    def payload_size(self, url: str) -> int:
+        stats = self.urls.get(url)
+        return stats.last_size if stats is not None else 0
+
+    def school_payload_bytes(self, school_id: int) -> int:
+        return sum(size for (sid, _), size in self.week_sizes.items() if sid == school_id)
+
+    def as_dict(self) -> dict[str, Any]:
+        fresh, not_modified = self.statuses["200"], self.statuses["304"]
+        revalidated = fresh + not_modified
+        return {
+            "requests": sum(self.statuses.values()),
+            "statuses": dict(self.statuses),
+            "bytes_received": self.bytes_received,
+            "update": self.update.as_dict(),
+            "json_decode": self.json_decode.as_dict(),
+            "week_parse": self.week_parse.as_dict(),
+            "districts_parse": self.districts_parse.as_dict(),
+            "legacy_scheme_weeks": self.legacy_scheme_weeks,
+            "scheme_fallbacks": self.scheme_fallbacks,
+            "caches": {
+                "not_modified": {
+                    "hits": not_modified,
+                    "misses": fresh,
+                    "hit_ratio": round(not_modified / revalidated, 3) if revalidated else None,
+                },
+                "districts": self.districts_cache.as_dict(),
+                "parsed_weeks": self.parsed_weeks.as_dict(),
+                "missing_weeks": self.missing_weeks.as_dict(),
+            },
+            "urls": {url: stats.as_dict() for url, stats in self.urls.items()},
+        }
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .client import SCHEMES
+from .const import (
+    DATA_URL_SCHEMES,
+    DOMAIN,
+    URL_SCHEME_REVALIDATE_DAYS,
+    URL_SCHEMES_STORAGE_KEY,
+    URL_SCHEMES_STORAGE_VERSION,
+)
+
+_SAVE_DELAY_SECONDS = 30
+
+
+class UrlSchemeStore:
+    """Which week-URL scheme each municipality publishes, persisted across restarts.
+
+    A remembered scheme is tried first. Once it is older than URL_SCHEME_REVALIDATE_DAYS the
+    default order is used again so a municipality that switched scheme is picked up.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, URL_SCHEMES_STORAGE_VERSION, URL_SCHEMES_STORAGE_KEY
+        )
+        self._entries: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load() or {}
+        self._entries = {
+            slug: entry
+            for slug, entry in (stored.get("entries") or {}).items()
+            if isinstance(entry, dict) and entry.get("scheme") in SCHEMES
+        }
+
+    def order(self, slug: str) -> tuple[str, ...]:
+        """Schemes to try for slug, best guess first."""
+        entry = self._entries.get(slug)
+        if entry is None or self._is_stale(entry):
+            return SCHEMES
+        preferred = entry["scheme"]
+        return (preferred, *(s for s in SCHEMES if s != preferred))
+
+    def remember(self, slug: str, scheme: str) -> None:
+        entry = self._entries.get(slug)
+        if entry is not None and entry["scheme"] == scheme and not self._is_stale(entry):
+            return
+        self._entries[slug] = {"scheme": scheme, "checked": time.time()}
+        self._store.async_delay_save(self._data_to_save, _SAVE_DELAY_SECONDS)
+
+    @staticmethod
+    def _is_stale(entry: dict[str, Any]) -> bool:
+        return time.time() - entry.get("checked", 0) > URL_SCHEME_REVALIDATE_DAYS * 86400
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"entries": self._entries}
+
+
+async def _async_load_url_schemes(hass: HomeAssistant) -> UrlSchemeStore:
+    schemes = UrlSchemeStore(hass)
+    await schemes.async_load()
+    return schemes
+
+
+async def async_get_url_schemes(hass: HomeAssistant) -> UrlSchemeStore:
+    """Return the shared scheme store, loading it from disk once on first use."""
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    task: asyncio.Task[UrlSchemeStore] | None = domain_data.get(DATA_URL_SCHEMES)
+    if task is None:
+        task = domain_data[DATA_URL_SCHEMES] = hass.async_create_task(
+            _async_load_url_schemes(hass)
+        )
+    try:
+        return await asyncio.shield(task)
+    except Exception:
+        domain_data.pop(DATA_URL_SCHEMES, None)
+        raise
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from .exception_days import EMPTY_EXCEPTION_DAYS, ExceptionDayIndex
+
+# Longest stretch walked to find the requested number of school days (a summer break listed
+# as exception days can be ten weeks); past it only the weekend rule applies.
+_MAX_WALK_DAYS = 366
+
+
+def _is_school_day(
+    day: date,
+    include_weekends: bool,
+    exception_days: ExceptionDayIndex,
+    menu_days: frozenset[str],
+    published: tuple[str, str] | None,
+) -> bool:
+    weekend = day.weekday() >= 5
+    if weekend and not include_weekends:
+        return False
+    if day in exception_days:
+        return False
+    if not weekend and published is not None:
+        key = day.isoformat()
+        if published[0] < key < published[1] and key not in menu_days:
+            return False
+    return True
+
+
+@dataclass(frozen=True, slots=True)
+class SchoolDays:
+    """School days from one day onward, shared by the day sensors and the calendar.
+
+    A day is not a school day if it is a weekend (unless weekends are included), one of the
+    school's exception days, or a weekday without a menu between the first and last published
+    menu day (holidays inside the published weeks). The first `count` school days are
+    precomputed once per coordinator update: `date_at` indexes a tuple and `offset_of` reads
+    an array indexed by days since `start`, so both directions are constant time.
+    """
+
+    start: date
+    include_weekends: bool
+    dates: tuple[date, ...]
+    offsets: array  # offsets[(day - start).days] -> offset, or -1 for non-school days
+    exception_days: ExceptionDayIndex = EMPTY_EXCEPTION_DAYS
+    menu_days: frozenset[str] = frozenset()
+    published: tuple[str, str] | None = None  # first and last ISO date with a menu
+
+    @classmethod
+    def build(
+        cls,
+        start: date,
+        meals_by_date: dict[str, list[str]],
+        exception_days: ExceptionDayIndex,
+        include_weekends: bool,
+        count: int,
+    ) -> SchoolDays:
+        menu_days = frozenset(key for key, names in meals_by_date.items() if names)
+        published = (min(menu_days), max(menu_days)) if menu_days else None
+        dates: list[date] = []
+        offsets = array("h")
+        day = start
+        for _ in range(_MAX_WALK_DAYS):
+            if len(dates) == count:
+                break
+            if _is_school_day(day, include_weekends, exception_days, menu_days, published):
+                offsets.append(len(dates))
+                dates.append(day)
+            else:
+                offsets.append(-1)
+            day += timedelta(days=1)
+        while len(dates) < count:
+            # Everything ahead is an exception: keep offsets defined with the weekend rule.
+            if include_weekends or day.weekday() < 5:
+                offsets.append(len(dates))
+                dates.append(day)
+            else:
+                offsets.append(-1)
+            day += timedelta(days=1)
+        return cls(
+            start=start,
+            include_weekends=include_weekends,
+            dates=tuple(dates),
+            offsets=offsets,
+            exception_days=exception_days,
+            menu_days=menu_days,
+            published=published,
+        )
+
+    def date_at(self, offset: int) -> date:
+        """Date of the offset-th school day (0 is the first school day from start)."""
+        return self.dates[offset]
+
+    def offset_of(self, day: date) -> int | None:
+        """Offset of a precomputed school day; None for other days or days outside the range."""
+        index = (day - self.start).days
+        if 0 <= index < len(self.offsets):
+            offset = self.offsets[index]
+            return offset if offset >= 0 else None
+        return None
+
+    def is_school_day(self, day: date) -> bool:
+        index = (day - self.start).days
+        if 0 <= index < len(self.offsets):
+            return self.offsets[index] >= 0
+        return _is_school_day(
+            day, self.include_weekends, self.exception_days, self.menu_days, self.published
+        )
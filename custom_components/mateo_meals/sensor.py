@@ -1,18 +1,27 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
-
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta
+from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import COORDINATORS
 from .const import (
+    ATTR_MEAL_NAME_MAX_CHARS,
+    ATTR_MENU_MAX_CHARS,
+    ATTR_UPCOMING_DAYS,
     DOMAIN,
     CONF_UPDATE_INTERVAL_HOURS,
     DEFAULT_UPDATE_INTERVAL_HOURS,
@@ -21,7 +30,14 @@ from .const import (
     CONF_INCLUDE_WEEKENDS,
     DEFAULT_INCLUDE_WEEKENDS,
 )
-from .coordinator import MateoConfig, MateoMealsCoordinator
+from .coordinator import (
+    MateoConfig,
+    MateoMealsCoordinator,
+    _data_today,
+    join_meals,
+    truncate_text,
+)
+from .entity import MateoCoordinatorEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,17 +62,55 @@ async def async_setup_entry(
                 coordinator, cfg, entry.entry_id, offset, include_weekends=include_weekends
             )
         )
+    # Disabled by default; enable them in the entity registry to graph fetch performance.
+    metric_sensors = [
+        MateoMetricSensor(coordinator, cfg, description) for description in METRIC_SENSORS
+    ]
     _LOGGER.debug(
         "Adding Mateo Meals sensors (%d day sensors + base) for school %s (entry %s)",
         len(day_sensors),
         cfg.school_name,
         entry.entry_id,
     )
-    async_add_entities([base_sensor, *day_sensors])
+    async_add_entities([base_sensor, *day_sensors, *metric_sensors])
 
 
-class MateoMealsSensor(CoordinatorEntity[MateoMealsCoordinator], SensorEntity):
+def _budget_menus(
+    today_meals: list[str], upcoming: dict[str, list[str]], max_chars: int
+) -> tuple[list[str], dict[str, list[str]], bool]:
+    """Fit today's meals and the upcoming days into max_chars meal name characters.
+
+    Names are clipped to ATTR_MEAL_NAME_MAX_CHARS; today's meals are kept name by name, upcoming
+    days only as a whole and in date order. Returns the kept parts and whether anything was cut.
+    """
+    budget = max_chars
+    truncated = False
+    kept_today: list[str] = []
+    for name in today_meals:
+        clipped = truncate_text(name, ATTR_MEAL_NAME_MAX_CHARS)
+        truncated |= clipped != name
+        if len(clipped) > budget:
+            return kept_today, {}, True
+        budget -= len(clipped)
+        kept_today.append(clipped)
+    kept_upcoming: dict[str, list[str]] = {}
+    for key, names in upcoming.items():
+        clipped_names = [truncate_text(name, ATTR_MEAL_NAME_MAX_CHARS) for name in names]
+        size = sum(len(name) for name in clipped_names)
+        if size > budget:
+            return kept_today, kept_upcoming, True
+        budget -= size
+        truncated |= clipped_names != names
+        kept_upcoming[key] = clipped_names
+    return kept_today, kept_upcoming, truncated
+
+
+class MateoMealsSensor(MateoCoordinatorEntity, SensorEntity):
     _attr_icon = "mdi:silverware-fork-knife"
+    # Rewritten with every menu change; the recorder keeps only the small attributes.
+    _unrecorded_attributes = frozenset({"today_meals", "upcoming_meals"})
+
+    _attributes_cache: tuple[Any, dict[str, Any]] | None = None
 
     def __init__(self, coordinator: MateoMealsCoordinator, cfg: MateoConfig, entry_id: str) -> None:
         super().__init__(coordinator)
@@ -76,38 +130,43 @@ class MateoMealsSensor(CoordinatorEntity[MateoMealsCoordinator], SensorEntity):
             names = [m for m in meals if isinstance(m, str) and m]
         else:
             names = [m.get("name") for m in meals if isinstance(m, dict) and m.get("name")]
-        return "; ".join(names) if names else "No menu today"
+        return join_meals(names) if names else "No menu today"
 
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
-        # Expose only minimal attributes to avoid large attribute payload warnings.
-        data = self.coordinator.data or {}
-        meals_today = data.get("today_meals") or []
+        data = self.coordinator.data
+        cached = self._attributes_cache
+        if cached is None or cached[0] is not data:
+            cached = self._attributes_cache = (data, self._build_attributes(data or {}))
+        return cached[1]
+
+    @staticmethod
+    def _build_attributes(data: dict[str, Any]) -> dict[str, Any]:
         meals_by_date = data.get("meals_by_date") or {}
-        # Provide a compact upcoming mapping for next 5 weekdays including today.
-        try:
-            utc = datetime.UTC  # type: ignore[attr-defined]
-        except AttributeError:  # pragma: no cover
-            from datetime import timezone as _tz
-            utc = _tz.utc
-        today = datetime.now(utc).date()
+        today: date = _data_today(data)
+        # Compact upcoming mapping for today and the following days that have a menu.
         upcoming: dict[str, list[str]] = {}
-        for i in range(5):
-            d = today + timedelta(days=i)
-            key = d.isoformat()
-            if key in meals_by_date:
+        for i in range(ATTR_UPCOMING_DAYS):
+            key = (today + timedelta(days=i)).isoformat()
+            if meals_by_date.get(key):
                 upcoming[key] = meals_by_date[key]
+        today_meals = [m for m in data.get("today_meals") or [] if isinstance(m, str)]
+        today_meals, upcoming, truncated = _budget_menus(today_meals, upcoming, ATTR_MENU_MAX_CHARS)
         return {
             "today_date": data.get("today_date"),
-            "today_meals": meals_today,
+            "today_meals": today_meals,
             "upcoming_meals": upcoming,
+            "menu_truncated": truncated,
             "exception_days_count": len(data.get("exception_days") or []),
         }
 
+    def _rendered(self) -> tuple[Any, ...]:
+        return (self.native_value, self.extra_state_attributes)
+
     # Rely on Home Assistant's default entity_id generation (no override)
 
 
-class MateoMealsFixedDaySensor(CoordinatorEntity[MateoMealsCoordinator], SensorEntity):
+class MateoMealsFixedDaySensor(MateoCoordinatorEntity, SensorEntity):
     _attr_icon = "mdi:food-hot-dog"
 
     def __init__(
@@ -126,73 +185,97 @@ class MateoMealsFixedDaySensor(CoordinatorEntity[MateoMealsCoordinator], SensorE
         label = "today" if day_offset == 0 else f"day{day_offset}"
         self._attr_name = f"Skollunch – {cfg.school_name} – {label}"
 
-    def _compute_target_date(self, base: date) -> date:
-        """Return the calendar date this sensor represents.
-
-        If weekends are excluded, offsets count only weekdays (Mon-Fri).
-        day_offset==0 refers to today unless today is a weekend and weekends are excluded;
-        in that case it refers to the next Monday.
-        """
-        if self._include_weekends:
-            return base + timedelta(days=self._day_offset)
-
-        # Shift base to next weekday if today is weekend for offset 0
-        if base.weekday() >= 5:
-            while base.weekday() >= 5:
-                base += timedelta(days=1)
-            if self._day_offset == 0:
-                return base
-
-        if self._day_offset == 0:
-            return base
-
-        # Count forward only weekdays
-        remaining = self._day_offset
-        current = base
-        while remaining > 0:
-            current += timedelta(days=1)
-            if current.weekday() < 5:
-                remaining -= 1
-        return current
-
     @property
     def native_value(self) -> str | None:
-        data = self.coordinator.data or {}
-        meals_by_date = data.get("meals_by_date") or {}
-        # Determine target date (UTC date basis as coordinator uses UTC date())
-        try:
-            utc = datetime.UTC  # type: ignore[attr-defined]
-        except AttributeError:  # pragma: no cover
-            from datetime import timezone as _tz
-
-            utc = _tz.utc
-        today = datetime.now(utc).date()
-        target: date = self._compute_target_date(today)
-        meals = meals_by_date.get(target.isoformat()) or []
-        if not meals:
-            # Provide consistent non-None to avoid 'unknown' for skipped days
-            return "No menu"
-        if isinstance(meals, list):
-            names = [m for m in meals if isinstance(m, str) and m]
-        else:  # defensive
-            return None
-        return "; ".join(names) if names else None
+        return self.coordinator.day_slot(self._day_offset, self._include_weekends).state
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         # Provide the date this sensor represents
-        try:
-            utc = datetime.UTC  # type: ignore[attr-defined]
-        except AttributeError:  # pragma: no cover
-            from datetime import timezone as _tz
-
-            utc = _tz.utc
-        today = datetime.now(utc).date()
-        target = self._compute_target_date(today)
-        has_meals = bool((self.coordinator.data or {}).get("meals_by_date", {}).get(target.isoformat()))
-        return {
-            "date": target.isoformat(),
-            "offset": self._day_offset,
-            "include_weekends": self._include_weekends,
-            "has_meals": has_meals,
-        }
+        return self.coordinator.day_slot(self._day_offset, self._include_weekends).attributes
+
+    def _rendered(self) -> tuple[Any, ...]:
+        slot = self.coordinator.day_slot(self._day_offset, self._include_weekends)
+        return (slot.state, slot.attributes)
+
+
+@dataclass(frozen=True, kw_only=True)
+class MateoMetricSensorDescription(SensorEntityDescription):
+    value_fn: Callable[[MateoMealsCoordinator], Any]
+
+
+METRIC_SENSORS: tuple[MateoMetricSensorDescription, ...] = (
+    MateoMetricSensorDescription(
+        key="refresh_duration",
+        name="refresh duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coord: coord.metrics.last_duration_ms,
+    ),
+    MateoMetricSensorDescription(
+        key="payload_size",
+        name="payload size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coord: coord.payload_bytes,
+    ),
+    MateoMetricSensorDescription(
+        key="consecutive_failures",
+        name="consecutive failures",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coord: coord.metrics.consecutive_failures,
+    ),
+    # The age of the data is now minus this timestamp; the frontend shows it as such.
+    MateoMetricSensorDescription(
+        key="last_success",
+        name="last successful refresh",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda coord: coord.metrics.last_success,
+    ),
+    MateoMetricSensorDescription(
+        key="next_refresh",
+        name="next refresh",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda coord: coord.municipality.next_refresh,
+    ),
+)
+
+
+class MateoMetricSensor(SensorEntity):
+    """Fetch metric of one school's coordinator, updated after every refresh attempt.
+
+    Refreshes that return unchanged menus notify no coordinator listeners, so these
+    sensors subscribe to the coordinator's metrics listeners instead.
+    """
+
+    entity_description: MateoMetricSensorDescription
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: MateoMealsCoordinator,
+        cfg: MateoConfig,
+        description: MateoMetricSensorDescription,
+    ) -> None:
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}:{cfg.slug}:{cfg.school_id}:{description.key}"
+        self._attr_name = f"Skollunch – {cfg.school_name} – {description.name}"
+
+    @property
+    def native_value(self) -> float | int | datetime | None:
+        return self.entity_description.value_fn(self.coordinator)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_metrics_listener(self._handle_metrics_update)
+        )
+
+    @callback
+    def _handle_metrics_update(self) -> None:
+        self.async_write_ha_state()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Offline load test: refresh rounds of N entries across M municipalities against a local
+Mateo stand-in (tests/mateo_server.py) and report request counts and refresh latency.
+
+    python scripts/mateo_load.py --entries 500 --municipalities 40 --latency 0.05 \
+        --error-rate 0.01 --iso-week-share 0.25 --rounds 3
+
+Each round mirrors one refresh of every municipality coordinator: districts.json once,
+then every school's horizon weeks under the per-municipality concurrency bound, with the
+URL scheme that last served a menu tried first and ETag validators kept between rounds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from mateo_server import MateoServer, MemoryValidators, ServerConfig  # noqa: E402
+
+from custom_components.mateo_meals.client import (  # noqa: E402
+    SCHEMES,
+    MateoApiError,
+    MateoClient,
+    MateoNotFoundError,
+    week_url,
+)
+from custom_components.mateo_meals.const import (  # noqa: E402
+    DEFAULT_HORIZON_WEEKS,
+    HTTP_LIMIT_PER_HOST,
+    MAX_CONCURRENT_REQUESTS,
+    PATH_DISTRICTS,
+)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+class LoadRun:
+    def __init__(self, client: MateoClient, server: MateoServer, horizon: int) -> None:
+        self.client = client
+        self.server = server
+        self.horizon = horizon
+        self.validators = MemoryValidators()
+        self.schemes: dict[str, str] = {}
+        self.failures = 0
+
+    def _scheme_order(self, slug: str) -> tuple[str, ...]:
+        known = self.schemes.get(slug)
+        if known is None:
+            return SCHEMES
+        return (known, *(s for s in SCHEMES if s != known))
+
+    async def _fetch_week(
+        self, sem: asyncio.Semaphore, slug: str, school_id: int, monday: date
+    ) -> Any:
+        for scheme in self._scheme_order(slug):
+            url = week_url(slug, school_id, monday, scheme, self.server.base_url)
+            try:
+                async with sem:
+                    payload = await self.client.async_get_json(url, self.validators)
+            except MateoNotFoundError:
+                continue
+            if payload:
+                self.schemes[slug] = scheme
+            return payload
+        return None
+
+    async def _refresh_school(
+        self, sem: asyncio.Semaphore, slug: str, school_id: int, today: date
+    ) -> float:
+        start = time.perf_counter()
+        monday = today - timedelta(days=today.weekday())
+        results = await asyncio.gather(
+            *(
+                self._fetch_week(sem, slug, school_id, monday + timedelta(weeks=i))
+                for i in range(self.horizon)
+            ),
+            return_exceptions=True,
+        )
+        self.failures += sum(isinstance(r, MateoApiError) for r in results)
+        return time.perf_counter() - start
+
+    async def _refresh_municipality(
+        self, slug: str, school_ids: list[int], today: date
+    ) -> tuple[float, list[float]]:
+        start = time.perf_counter()
+        sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        try:
+            url = self.server.base_url + PATH_DISTRICTS.format(slug=slug)
+            await self.client.async_get_json(url, self.validators)
+        except MateoApiError:
+            self.failures += 1
+        schools = await asyncio.gather(
+            *(self._refresh_school(sem, slug, school_id, today) for school_id in school_ids)
+        )
+        return time.perf_counter() - start, list(schools)
+
+    async def round(self, today: date) -> dict[str, object]:
+        self.server.stats.reset()
+        self.failures = 0
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                self._refresh_municipality(slug, school_ids, today)
+                for slug, school_ids in self.server.schools.items()
+                if school_ids
+            )
+        )
+        wall = time.perf_counter() - start
+        municipalities = [r[0] for r in results]
+        schools = [s for r in results for s in r[1]]
+        stats = self.server.stats
+        return {
+            "wall_s": wall,
+            "requests": stats.total,
+            "by_kind": dict(stats.by_kind),
+            "by_status": dict(sorted(stats.by_status.items())),
+            "failed_fetches": self.failures,
+            "municipality_p50_s": statistics.median(municipalities) if municipalities else 0.0,
+            "municipality_p95_s": _percentile(municipalities, 95),
+            "school_p50_s": statistics.median(schools) if schools else 0.0,
+            "school_p95_s": _percentile(schools, 95),
+        }
+
+
+async def _main(args: argparse.Namespace) -> None:
+    config = ServerConfig(
+        municipalities=args.municipalities,
+        schools=args.entries,
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        error_rate=args.error_rate,
+        iso_week_share=args.iso_week_share,
+        etags=not args.no_etags,
+        seed=args.seed,
+    )
+    async with MateoServer(config) as server:
+        connector = aiohttp.TCPConnector(limit_per_host=args.limit_per_host)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            client = MateoClient(session, base_url=server.base_url, backoff=args.backoff)
+            run = LoadRun(client, server, args.horizon)
+            await client.async_get_municipalities()
+            today = date.today()
+            for n in range(1, args.rounds + 1):
+                report = await run.round(today)
+                print(f"round {n}:")
+                for key, value in report.items():
+                    if isinstance(value, float):
+                        value = f"{value:.3f}"
+                    print(f"  {key:20} {value}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=500, help="schools (config entries)")
+    parser.add_argument("--municipalities", type=int, default=40)
+    parser.add_argument("--horizon", type=int, default=DEFAULT_HORIZON_WEEKS)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 503 responses")
+    parser.add_argument("--iso-week-share", type=float, default=0.25)
+    parser.add_argument("--no-etags", action="store_true", help="disable ETag/304 support")
+    parser.add_argument("--limit-per-host", type=int, default=HTTP_LIMIT_PER_HOST)
+    parser.add_argument("--backoff", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
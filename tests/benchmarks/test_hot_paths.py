@@ -0,0 +1,187 @@
+"""pytest-benchmark suite for the integration's hot paths.
+
+Run with ``pytest tests/benchmarks --benchmark-only --no-cov``; CI saves every run and flags
+(without blocking) a benchmark that regresses by more than the configured threshold.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Coroutine
+from datetime import UTC, date, timedelta
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.mateo_meals.calendar import MateoMealsCalendarEntity
+from custom_components.mateo_meals.client import (
+    exception_days_by_school,
+    parse_exception_days,
+    parse_week_payloads,
+)
+from custom_components.mateo_meals.const import MAX_DAYS_AHEAD
+from custom_components.mateo_meals.coordinator import (
+    MateoConfig,
+    MateoMealsCoordinator,
+    _compose_data,
+)
+from custom_components.mateo_meals.exception_days import ExceptionDayIndex
+from custom_components.mateo_meals.sensor import MateoMealsFixedDaySensor, MateoMealsSensor
+
+pytest.importorskip("pytest_benchmark")
+
+YEARS = 3
+SERVED_DAYS = 5 * 52 * YEARS - 5 * 10  # weekdays minus the exception weeks
+FIRST_MONDAY = date(2023, 1, 2)
+FIRST_SERVED_DAY = FIRST_MONDAY + timedelta(weeks=10)  # the first ten weeks are study weeks
+TODAY = FIRST_MONDAY + timedelta(weeks=52 * YEARS - 4)
+CFG = MateoConfig(slug="molndal", school_id=13, school_name="Skolan", municipality_name="Mölndal")
+
+
+def _timestamp(day: date) -> str:
+    return f"{day.isoformat()}T00:00:00.000Z"
+
+
+def _week_payloads(weeks: int) -> list[list[dict[str, Any]]]:
+    payloads = []
+    for w in range(weeks):
+        monday = FIRST_MONDAY + timedelta(weeks=w)
+        payloads.append(
+            [
+                {
+                    "date": _timestamp(monday + timedelta(days=d)),
+                    "meals": [
+                        {"name": f"  Huvudrätt {w}-{d} med potatis och sås  "},
+                        {"name": f"Vegetariskt alternativ {w}-{d}"},
+                        {"name": "Salladsbuffé"},
+                    ],
+                }
+                for d in range(5)
+            ]
+        )
+    return payloads
+
+
+def _districts(count: int, days_per_district: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "name": f"Skola {i}",
+            "districts_exception_days": [
+                {
+                    "name": f"Studiedag {k}",
+                    "start": _timestamp(FIRST_MONDAY + timedelta(days=7 * k)),
+                    "end": _timestamp(FIRST_MONDAY + timedelta(days=7 * k + 4)),
+                }
+                for k in range(days_per_district)
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def _data() -> dict[str, Any]:
+    meals = parse_week_payloads(_week_payloads(52 * YEARS))
+    # One school with ten study weeks early in the data; their lunches are not served.
+    exception_days = ExceptionDayIndex.from_days(parse_exception_days(_districts(1, 10)))
+    return _compose_data(TODAY, meals, exception_days)
+
+
+def _run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    # Ranges inside the in-memory index never reach the archive, so the coroutine finishes
+    # without suspending and can be driven outside the running loop.
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    coro.close()
+    raise AssertionError("async_get_events suspended")
+
+
+def _coordinator(hass: HomeAssistant) -> MateoMealsCoordinator:
+    coord = MateoMealsCoordinator(hass, CFG)
+    coord.async_set_updated_data(_data())
+    return coord
+
+
+def _calendar(coord: MateoMealsCoordinator) -> MateoMealsCalendarEntity:
+    cal = MateoMealsCalendarEntity(
+        coordinator=coord,
+        cfg=CFG,
+        entry_id="bench",
+        serving_start="10:30",
+        serving_end="12:30",
+        days_ahead=14,
+        include_weekends=False,
+    )
+    cal.hass = coord.hass  # index events in the instance's time zone, as when added
+    return cal
+
+
+def test_bench_parse_week_payloads(benchmark: Any) -> None:
+    payloads = _week_payloads(52 * YEARS)
+    result = benchmark(parse_week_payloads, payloads)
+    assert len(result) == 5 * 52 * YEARS
+
+
+def test_bench_parse_exception_days(benchmark: Any) -> None:
+    districts = _districts(500, 20)
+    result = benchmark(exception_days_by_school, districts)
+    assert sum(len(days) for days in result.values()) == 500 * 20
+
+
+def test_bench_exception_day_index(benchmark: Any) -> None:
+    days = parse_exception_days(_districts(1, 100))
+    index = ExceptionDayIndex.from_days(days)
+    probes = [FIRST_MONDAY + timedelta(days=i) for i in range(365 * YEARS)]
+    hits = benchmark(lambda: sum(day in index for day in probes))
+    assert hits == 5 * 100
+
+
+@pytest.mark.asyncio
+async def test_bench_calendar_index_build(hass: HomeAssistant, benchmark: Any) -> None:
+    coord = _coordinator(hass)
+    cal = _calendar(coord)
+    index = benchmark(cal._build_index, coord.data, UTC)
+    assert len(index.events) == SERVED_DAYS
+
+
+@pytest.mark.asyncio
+async def test_bench_calendar_events_wide_range(hass: HomeAssistant, benchmark: Any) -> None:
+    cal = _calendar(_coordinator(hass))
+    # Starting at local midnight of the first indexed (served) day keeps the range out of
+    # the archive; every later served day falls inside it.
+    start = dt_util.start_of_local_day(FIRST_SERVED_DAY)
+    end = dt_util.start_of_local_day(FIRST_MONDAY + timedelta(days=365 * YEARS))
+    events = benchmark(lambda: _run_sync(cal.async_get_events(hass, start, end)))
+    assert len(events) == SERVED_DAYS
+
+
+@pytest.mark.asyncio
+async def test_bench_calendar_next_event(hass: HomeAssistant, benchmark: Any) -> None:
+    cal = _calendar(_coordinator(hass))
+    benchmark(lambda: cal.event)
+
+
+@pytest.mark.asyncio
+async def test_bench_day_sensors_after_update(hass: HomeAssistant, benchmark: Any) -> None:
+    coord = _coordinator(hass)
+    sensors = [
+        MateoMealsFixedDaySensor(coord, CFG, "bench", offset, include_weekends=False)
+        for offset in range(MAX_DAYS_AHEAD)
+    ]
+
+    def render() -> list[tuple[Any, Any]]:
+        coord.data = dict(coord.data)  # new data version, as after a coordinator update
+        return [(s.native_value, s.extra_state_attributes) for s in sensors]
+
+    rendered = benchmark(render)
+    assert len(rendered) == MAX_DAYS_AHEAD
+
+
+@pytest.mark.asyncio
+async def test_bench_base_sensor_attributes(hass: HomeAssistant, benchmark: Any) -> None:
+    sensor = MateoMealsSensor(_coordinator(hass), CFG, "bench")
+    attrs = benchmark(lambda: (sensor.native_value, sensor.extra_state_attributes))
+    assert attrs[1]["exception_days_count"] == 10
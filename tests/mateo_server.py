@@ -0,0 +1,280 @@
+"""Local stand-in for the Mateo object store, for offline integration and load tests.
+
+Serves municipalities.json, districts.json and week menu files from synthetic data or from a
+directory of recorded responses, with configurable latency, error rate, ETag/304 support and
+a per-municipality mix of numeric and ISO-week URL schemes. Every request is counted.
+
+    async with MateoServer(ServerConfig(municipalities=40, schools=500)) as server:
+        client = MateoClient(session, base_url=server.base_url)
+
+scripts/mateo_load.py drives production-sized refresh rounds against it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+RECORDED_FIXTURES = Path(__file__).parent / "fixtures" / "mateo"
+
+_MENU_RE = re.compile(r"^(?P<school>\d+)_(?P<week>\d{1,2}|\d{4}-W\d{2})\.json$")
+
+_DISHES = (
+    "Köttbullar med potatismos",
+    "Fiskgratäng",
+    "Pasta med tomatsås",
+    "Kycklinggryta med ris",
+    "Vegetarisk lasagne",
+    "Ärtsoppa och pannkakor",
+    "Korv stroganoff",
+    "Falafel med bulgur",
+)
+
+
+@dataclass
+class ServerConfig:
+    municipalities: int = 3
+    schools: int = 10  # spread round-robin over the municipalities
+    latency: float = 0.0  # seconds added to every response
+    latency_jitter: float = 0.0  # +/- uniform jitter on top of latency
+    error_rate: float = 0.0  # probability of a 503 per request
+    fail_first: int = 0  # answer the first N requests with 503 (a deterministic fault schedule)
+    iso_week_share: float = 0.0  # share of municipalities publishing only {YYYY-Www} files
+    etags: bool = True  # send ETag / honour If-None-Match with 304
+    empty_weeks: frozenset[date] = frozenset()  # Mondays of weeks served as [] (holidays)
+    missing_weeks: frozenset[date] = frozenset()  # Mondays of weeks answered with 404
+    publish_ahead_weeks: int | None = None  # weeks after the current one that exist yet
+    today: Callable[[], date] = date.today  # server clock (simulations move it)
+    recorded: Path | None = None  # serve files from here (same layout as the object store)
+    seed: int = 0
+
+
+@dataclass
+class RequestStats:
+    total: int = 0
+    bytes_sent: int = 0
+    by_kind: Counter[str] = field(default_factory=Counter)
+    by_status: Counter[int] = field(default_factory=Counter)
+
+    def reset(self) -> None:
+        self.total = 0
+        self.bytes_sent = 0
+        self.by_kind.clear()
+        self.by_status.clear()
+
+
+class MemoryValidators:
+    """In-memory ConditionalCache for driving MateoClient without Home Assistant storage."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[str | None, str | None, Any]] = {}
+
+    def request_headers(self, url: str) -> dict[str, str]:
+        etag, last_modified, _ = self._entries.get(url, (None, None, None))
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def payload(self, url: str) -> Any:
+        return self._entries.get(url, (None, None, None))[2]
+
+    def remember(
+        self, url: str, etag: str | None, last_modified: str | None, payload: Any
+    ) -> None:
+        if etag or last_modified:
+            self._entries[url] = (etag, last_modified, payload)
+
+    def forget(self, url: str) -> None:
+        self._entries.pop(url, None)
+
+
+def synthetic_week(monday: date, school_id: int) -> list[dict[str, Any]]:
+    days = []
+    for i in range(5):
+        day = monday + timedelta(days=i)
+        dish = _DISHES[(day.toordinal() + school_id) % len(_DISHES)]
+        days.append(
+            {
+                "date": f"{day.isoformat()}T00:00:00.000Z",
+                "meals": [{"name": dish}, {"name": "Salladsbuffé"}],
+            }
+        )
+    return days
+
+
+class MateoServer:
+    def __init__(self, config: ServerConfig | None = None) -> None:
+        self.config = config or ServerConfig()
+        self.stats = RequestStats()
+        # Seeded for reproducible latency and 503 injection, not for anything secret.
+        self._random = random.Random(self.config.seed)  # noqa: S311
+        self._requests = 0  # unlike stats.total, never reset
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+        slugs = [f"kommun{i:02d}" for i in range(self.config.municipalities)]
+        iso_count = round(len(slugs) * self.config.iso_week_share)
+        self.iso_week_slugs = set(slugs[:iso_count])
+        self.schools: dict[str, list[int]] = {slug: [] for slug in slugs}
+        for school_id in range(1, self.config.schools + 1):
+            self.schools[slugs[(school_id - 1) % len(slugs)]].append(school_id)
+
+    async def __aenter__(self) -> MateoServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.stop()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        app = web.Application()
+        app.router.add_get("/mateo.shared/mateo-menu/municipalities.json", self._municipalities)
+        app.router.add_get("/mateo.{slug}/menus/app/{name}", self._municipality_file)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound = site._server.sockets[0].getsockname()  # type: ignore[union-attr]
+        self.base_url = f"http://{bound[0]}:{bound[1]}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # Handlers ----------------------------------------------------------------------------
+
+    async def _municipalities(self, request: web.Request) -> web.StreamResponse:
+        return await self._respond(request, "municipalities", self._municipalities_payload)
+
+    async def _municipality_file(self, request: web.Request) -> web.StreamResponse:
+        slug = request.match_info["slug"]
+        name = request.match_info["name"]
+        if name == "districts.json":
+            return await self._respond(request, "districts", lambda: self._districts_payload(slug))
+        match = _MENU_RE.match(name)
+        if not match:
+            return await self._respond(request, "other", lambda: None)
+        school_id = int(match["school"])
+        week = match["week"]
+        return await self._respond(
+            request, "menu", lambda: self._menu_payload(slug, school_id, week)
+        )
+
+    async def _respond(self, request: web.Request, kind: str, build: Any) -> web.StreamResponse:
+        self.stats.total += 1
+        self._requests += 1
+        self.stats.by_kind[kind] += 1
+        cfg = self.config
+        delay = cfg.latency + self._random.uniform(-cfg.latency_jitter, cfg.latency_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._requests <= cfg.fail_first or (
+            cfg.error_rate and self._random.random() < cfg.error_rate
+        ):
+            return self._finish(web.Response(status=503, text="SlowDown"))
+        payload = self._recorded(request.path) if cfg.recorded else build()
+        if payload is None:
+            return self._finish(web.Response(status=404, text="NoSuchKey"))
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        headers = {"Content-Type": "application/json"}
+        if cfg.etags:
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'  # noqa: S324
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                return self._finish(web.Response(status=304, headers={"ETag": etag}))
+        return self._finish(web.Response(body=body, headers=headers))
+
+    def _finish(self, response: web.Response) -> web.Response:
+        self.stats.by_status[response.status] += 1
+        self.stats.bytes_sent += response.content_length or 0
+        return response
+
+    # Payloads ----------------------------------------------------------------------------
+
+    def _recorded(self, path: str) -> Any:
+        assert self.config.recorded is not None
+        file = self.config.recorded / path.lstrip("/")
+        if not file.is_file():
+            return None
+        return json.loads(file.read_text(encoding="utf-8"))
+
+    def _municipalities_payload(self) -> Any:
+        return [
+            {
+                "name": "Region",
+                "municipalities": [
+                    {"slug": slug, "name": slug.capitalize()} for slug in self.schools
+                ],
+            }
+        ]
+
+    def _districts_payload(self, slug: str) -> Any:
+        if slug not in self.schools:
+            return None
+        return {
+            "districts": [
+                {
+                    "id": school_id,
+                    "name": f"Skola {school_id}",
+                    "districts_exception_days": [
+                        {
+                            "name": "Studiedag",
+                            "start": "2025-10-01T00:00:00.000Z",
+                            "end": "2025-10-01T00:00:00.000Z",
+                        }
+                    ],
+                }
+                for school_id in self.schools[slug]
+            ]
+        }
+
+    def _menu_payload(self, slug: str, school_id: int, week: str) -> Any:
+        if school_id not in self.schools.get(slug, ()):
+            return None
+        iso_only = slug in self.iso_week_slugs
+        if ("-W" in week) != iso_only:
+            return None  # this municipality publishes the other scheme
+        today = self.config.today()
+        if iso_only:
+            try:
+                monday = date.fromisocalendar(int(week[:4]), int(week[6:]), 1)
+            except ValueError:
+                return None
+        else:
+            monday = self._closest_monday(today, int(week))
+            if monday is None:
+                return None
+        ahead = self.config.publish_ahead_weeks
+        this_monday = today - timedelta(days=today.weekday())
+        if ahead is not None and monday > this_monday + timedelta(weeks=ahead):
+            return None
+        if monday in self.config.missing_weeks:
+            return None
+        if monday in self.config.empty_weeks:
+            return []
+        return synthetic_week(monday, school_id)
+
+    @staticmethod
+    def _closest_monday(today: date, weeknum: int) -> date | None:
+        # Numeric files carry no year; serve the week nearest to today (W53 only in long years).
+        candidates = []
+        for year in (today.year - 1, today.year, today.year + 1):
+            try:
+                candidates.append(date.fromisocalendar(year, weeknum, 1))
+            except ValueError:
+                continue
+        return min(candidates, key=lambda m: abs((m - today).days), default=None)
@@ -0,0 +1,342 @@
+"""Fleet simulation: many MateoMealsCoordinator views against the local Mateo stand-in under a
+simulated clock.
+
+A scenario steps a clock through days or a whole school year (ISO 53-week years, week
+rollovers, holiday gaps, the summer break). Municipality coordinators refresh on their own
+polling interval in simulated time and roll over at local midnight; the server serves weeks
+relative to the same clock. The report lists what a refresh policy costs:
+
+    report = await async_run_scenario(hass, school_year_scenario(2026), tmp_path)
+    print(report.format())
+
+The menu archive is written to workdir/archive.db and left there for inspection.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from mateo_server import MateoServer, ServerConfig
+
+from custom_components.mateo_meals import coordinator as coordinator_module
+from custom_components.mateo_meals.archive import MenuArchive
+from custom_components.mateo_meals.client import MateoClient
+from custom_components.mateo_meals.const import (
+    DATA_API_CLIENT,
+    DATA_ARCHIVE,
+    DATA_MUNICIPALITIES,
+    DEFAULT_HORIZON_WEEKS,
+    DOMAIN,
+)
+from custom_components.mateo_meals.coordinator import (
+    MateoConfig,
+    MateoMealsCoordinator,
+    MateoMunicipalityCoordinator,
+    async_get_municipality_coordinator,
+)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    start: date
+    days: int
+    municipalities: int = 4
+    entries: int = 40
+    update_hours: int = 4
+    horizon_weeks: int = DEFAULT_HORIZON_WEEKS
+    holiday_weeks: frozenset[date] = frozenset()  # served as [] (published, no lunches)
+    missing_weeks: frozenset[date] = frozenset()  # answered with 404 (summer break)
+    publish_ahead_weeks: int | None = 2
+    iso_week_share: float = 0.25
+    step: timedelta = timedelta(hours=1)
+    trace_memory: bool = True
+
+
+@dataclass
+class SimulationReport:
+    scenario: str
+    simulated_days: int
+    entries: int
+    refreshes: int = 0
+    failed_refreshes: int = 0
+    rollovers: int = 0
+    requests: int = 0
+    requests_by_status: dict[int, int] = field(default_factory=dict)
+    bytes_transferred: int = 0
+    parse_calls: int = 0
+    parse_seconds: float = 0.0
+    loop_busy_seconds: float = 0.0
+    loop_max_block_seconds: float = 0.0
+    peak_memory_bytes: int = 0
+    wall_seconds: float = 0.0
+
+    def format(self) -> str:
+        per_entry_day = self.requests / max(1, self.entries * self.simulated_days)
+        return "\n".join(
+            [
+                f"scenario            {self.scenario}",
+                f"simulated           {self.simulated_days} days, {self.entries} entries",
+                f"refreshes           {self.refreshes} ({self.failed_refreshes} failed), "
+                f"{self.rollovers} rollovers",
+                f"requests            {self.requests} ({per_entry_day:.2f} per entry-day) "
+                f"{dict(sorted(self.requests_by_status.items()))}",
+                f"bytes transferred   {self.bytes_transferred}",
+                f"parse time          {self.parse_seconds:.3f} s in {self.parse_calls} calls",
+                f"event loop busy     {self.loop_busy_seconds:.3f} s, "
+                f"longest callback {self.loop_max_block_seconds * 1000:.1f} ms",
+                f"peak memory         {self.peak_memory_bytes / 1_048_576:.1f} MiB",
+                f"wall time           {self.wall_seconds:.1f} s",
+            ]
+        )
+
+
+def _iso_mondays(year: int, weeks: list[int]) -> set[date]:
+    mondays = set()
+    for week in weeks:
+        try:
+            mondays.add(date.fromisocalendar(year, week, 1))
+        except ValueError:  # week 53 in a 52-week year
+            continue
+    return mondays
+
+
+def school_year_scenario(year: int, **overrides: Any) -> Scenario:
+    """A full year from August 1st: autumn, Christmas, winter and Easter breaks served as
+    empty weeks and the summer break (weeks 25-33) missing, as municipalities publish them."""
+    holidays = _iso_mondays(year, [44, 52, 53]) | _iso_mondays(year + 1, [1, 8, 15])
+    summer = _iso_mondays(year + 1, list(range(25, 34)))
+    values: dict[str, Any] = {
+        "name": f"school-year-{year}",
+        "start": date(year, 8, 1),
+        "days": 365,
+        "municipalities": 20,
+        "entries": 200,
+        "holiday_weeks": frozenset(holidays),
+        "missing_weeks": frozenset(summer),
+    }
+    values.update(overrides)
+    return Scenario(**values)
+
+
+class SimClock:
+    """Simulated wall clock shared by Home Assistant helpers, the integration and the server."""
+
+    def __init__(self, start: datetime) -> None:
+        self.now = start
+
+    def utcnow(self) -> datetime:
+        return self.now
+
+    def timestamp(self) -> float:
+        return self.now.timestamp()
+
+    def local_today(self) -> date:
+        return dt_util.as_local(self.now).date()
+
+    def advance(self, delta: timedelta) -> None:
+        self.now += delta
+
+    @contextmanager
+    def installed(self) -> Iterator[SimClock]:
+        fake_time = SimpleNamespace(time=self.timestamp, monotonic=self.timestamp)
+        with ExitStack() as stack:
+            stack.enter_context(patch.object(dt_util, "utcnow", self.utcnow))
+            stack.enter_context(
+                patch.object(coordinator_module, "_local_today", self.local_today)
+            )
+            # TTLs of the districts cache, validators and remembered URL schemes.
+            for module in ("cache", "http_cache", "schemes"):
+                stack.enter_context(
+                    patch(f"custom_components.mateo_meals.{module}.time", fake_time)
+                )
+            yield self
+
+
+class LoopProfiler:
+    """CPU time spent in event-loop callbacks on one thread, and the longest single callback."""
+
+    def __init__(self) -> None:
+        self.busy = 0.0
+        self.max_block = 0.0
+
+    @contextmanager
+    def attached(self) -> Iterator[LoopProfiler]:
+        original = asyncio.events.Handle._run
+        thread_id = threading.get_ident()
+        profiler = self
+
+        def _run(handle: asyncio.events.Handle) -> None:
+            if threading.get_ident() != thread_id:
+                return original(handle)
+            start = time.thread_time()
+            try:
+                return original(handle)
+            finally:
+                elapsed = time.thread_time() - start
+                profiler.busy += elapsed
+                profiler.max_block = max(profiler.max_block, elapsed)
+
+        with patch.object(asyncio.events.Handle, "_run", _run):
+            yield self
+
+
+@contextmanager
+def _timed(report: SimulationReport, name: str) -> Iterator[None]:
+    original: Callable[..., Any] = getattr(coordinator_module, name)
+
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.thread_time()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            report.parse_seconds += time.thread_time() - start
+            report.parse_calls += 1
+
+    with patch.object(coordinator_module, name, wrapper):
+        yield
+
+
+class _ServerThread:
+    """MateoServer on its own loop and thread so its work does not count as integration time."""
+
+    def __init__(self, config: ServerConfig) -> None:
+        self.server = MateoServer(config)
+        self._loop = asyncio.new_event_loop()
+        # Daemon, so a failure that skips the shutdown below cannot keep the process alive.
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="mateo-server", daemon=True
+        )
+
+    def __enter__(self) -> MateoServer:
+        self._thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(self.server.start(), self._loop).result()
+        except BaseException:
+            # __exit__ does not run when __enter__ raises (e.g. sockets blocked).
+            self._shutdown()
+            raise
+        return self.server
+
+    def __exit__(self, *exc: object) -> None:
+        try:
+            asyncio.run_coroutine_threadsafe(self.server.stop(), self._loop).result()
+        finally:
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+async def async_run_scenario(
+    hass: HomeAssistant, scenario: Scenario, workdir: Path
+) -> SimulationReport:
+    report = SimulationReport(
+        scenario=scenario.name, simulated_days=scenario.days, entries=scenario.entries
+    )
+    clock = SimClock(dt_util.as_utc(dt_util.start_of_local_day(scenario.start)))
+    config = ServerConfig(
+        municipalities=scenario.municipalities,
+        schools=scenario.entries,
+        iso_week_share=scenario.iso_week_share,
+        empty_weeks=scenario.holiday_weeks,
+        missing_weeks=scenario.missing_weeks,
+        publish_ahead_weeks=scenario.publish_ahead_weeks,
+        today=clock.local_today,
+    )
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    domain_data[DATA_ARCHIVE] = archive = MenuArchive(hass, str(workdir / "archive.db"))
+    wall_start = time.perf_counter()
+
+    with ExitStack() as stack:
+        server = stack.enter_context(_ServerThread(config))
+        stack.enter_context(clock.installed())
+        stack.enter_context(_timed(report, "parse_week_meals"))
+        stack.enter_context(_timed(report, "exception_days_by_school"))
+        profiler = stack.enter_context(LoopProfiler().attached())
+        if scenario.trace_memory:
+            tracemalloc.start()
+            stack.callback(tracemalloc.stop)
+
+        session = aiohttp.ClientSession()
+        domain_data[DATA_API_CLIENT] = MateoClient(session, base_url=server.base_url, backoff=0)
+        municipalities: dict[str, MateoMunicipalityCoordinator] = {}
+        views: list[MateoMealsCoordinator] = []
+        unsubs: list[Callable[[], None]] = []
+        for slug, school_ids in server.schools.items():
+            for school_id in school_ids:
+                municipality = async_get_municipality_coordinator(
+                    hass, slug, scenario.update_hours
+                )
+                municipalities[slug] = municipality
+                cfg = MateoConfig(
+                    slug=slug,
+                    school_id=school_id,
+                    school_name=f"Skola {school_id}",
+                    municipality_name=slug,
+                )
+                view = MateoMealsCoordinator(
+                    hass, cfg, scenario.update_hours, municipality, scenario.horizon_weeks
+                )
+                views.append(view)
+                unsubs.append(view.async_add_listener(lambda: None))
+
+        try:
+            next_refresh = dict.fromkeys(municipalities, clock.now)
+            end = clock.now + timedelta(days=scenario.days)
+            local_day = clock.local_today()
+            while clock.now < end:
+                if clock.local_today() != local_day:
+                    local_day = clock.local_today()
+                    report.rollovers += 1
+                    for municipality in municipalities.values():
+                        municipality._async_handle_rollover(dt_util.as_local(clock.now))
+                due = [m for slug, m in municipalities.items() if next_refresh[slug] <= clock.now]
+                if due:
+                    await asyncio.gather(*(m.async_refresh() for m in due))
+                    for municipality in due:
+                        report.refreshes += 1
+                        report.failed_refreshes += not municipality.last_update_success
+                        interval = municipality.update_interval or timedelta(hours=1)
+                        next_refresh[municipality.slug] = clock.now + interval
+                    await hass.async_block_till_done()
+                clock.advance(scenario.step)
+        finally:
+            for unsub in unsubs:
+                unsub()
+            for view in views:
+                view.async_detach()
+            for municipality in municipalities.values():
+                await municipality.async_shutdown()
+            domain_data.pop(DATA_API_CLIENT, None)
+            await session.close()
+            domain_data.pop(DATA_ARCHIVE, None)
+            await archive.async_close()
+            domain_data.pop(DATA_MUNICIPALITIES, None)
+
+        if scenario.trace_memory:
+            report.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        report.loop_busy_seconds = profiler.busy
+        report.loop_max_block_seconds = profiler.max_block
+        report.requests = server.stats.total
+        report.requests_by_status = dict(server.stats.by_status)
+        report.bytes_transferred = server.stats.bytes_sent
+
+    report.wall_seconds = time.perf_counter() - wall_start
+    return report
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.mateo_meals.archive import MenuArchive, async_get_menu_archive
+from custom_components.mateo_meals.calendar import MateoMealsCalendarEntity
+from custom_components.mateo_meals.coordinator import MateoConfig, MateoMealsCoordinator
+
+
+@pytest.mark.asyncio
+async def test_archive_upserts_and_scans_ranges(hass: HomeAssistant, tmp_path) -> None:
+    archive = MenuArchive(hass, str(tmp_path / "archive.db"))
+    await archive.async_store("molndal", {13: {"2025-08-18": ["Fisk"], "2025-08-19": ["Soppa"]}})
+    await archive.async_store(
+        "molndal", {13: {"2025-08-19": ["Pasta"]}, 14: {"2025-08-19": ["Tacos"]}}
+    )
+    got = await archive.async_range("molndal", 13, date(2025, 8, 1), date(2025, 8, 31))
+    assert got == {"2025-08-18": ["Fisk"], "2025-08-19": ["Pasta"]}
+    assert await archive.async_range("molndal", 13, date(2025, 8, 19), date(2025, 8, 19)) == {
+        "2025-08-19": ["Pasta"]
+    }
+    # Full meals are stored as parsed; names-only rows read back with unknown allergens.
+    pasta = {"name": "Pasta", "type": "Lunch 1", "categories": [], "allergens": ["Gluten"]}
+    await archive.async_store("molndal", {13: {"2025-08-19": [pasta]}})
+    assert await archive.async_range("molndal", 13, date(2025, 8, 18), date(2025, 8, 19)) == got
+    meals = await archive.async_range_meals("molndal", 13, date(2025, 8, 18), date(2025, 8, 19))
+    assert meals == {
+        "2025-08-18": [{"name": "Fisk", "type": None, "categories": [], "allergens": None}],
+        "2025-08-19": [pasta],
+    }
+    await archive.async_close()
+
+
+@pytest.mark.asyncio
+async def test_calendar_reads_history_from_archive(hass: HomeAssistant, tmp_path) -> None:
+    hass.data.setdefault("mateo_meals", {})["archive"] = MenuArchive(hass, str(tmp_path / "a.db"))
+    archive = async_get_menu_archive(hass)
+    await archive.async_store("molndal", {13: {"2025-08-18": ["Fisk"], "2025-09-15": ["Gammal"]}})
+    cfg = MateoConfig(
+        slug="molndal", school_id=13, school_name="School", municipality_name="Mölndal"
+    )
+    coord = MateoMealsCoordinator(hass, cfg)
+    coord.async_set_updated_data({"meals_by_date": {"2025-09-15": ["Korv"]}})
+    cal = MateoMealsCalendarEntity(
+        coordinator=coord,
+        cfg=cfg,
+        entry_id="entry",
+        serving_start="10:00",
+        serving_end="12:00",
+        days_ahead=5,
+        include_weekends=False,
+    )
+    start = datetime(2025, 8, 1, tzinfo=UTC)
+    events = await cal.async_get_events(hass, start, start + timedelta(days=60))
+    assert [e.summary for e in events] == ["Fisk", "Korv"]
+    await archive.async_close()
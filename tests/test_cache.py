@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.mateo_meals.cache import DistrictsCache, async_get_districts_cache
+from custom_components.mateo_meals.coordinator import MateoConfig, MateoMealsCoordinator
+
+
+@pytest.mark.asyncio
+async def test_districts_cache_single_flight() -> None:
+    cache = DistrictsCache(ttl_seconds=60)
+    calls = 0
+
+    async def fetch() -> Any:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"districts": []}
+
+    results = await asyncio.gather(*(cache.async_get("molndal", fetch) for _ in range(5)))
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+    # Served from cache while fresh
+    await cache.async_get("molndal", fetch)
+    assert calls == 1
+    cache.invalidate("molndal")
+    await cache.async_get("molndal", fetch)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_districts_cache_does_not_store_failures() -> None:
+    cache = DistrictsCache(ttl_seconds=60)
+
+    async def failing() -> Any:
+        raise RuntimeError("boom")
+
+    async def ok() -> Any:
+        return {"districts": [{"id": 1}]}
+
+    with pytest.raises(RuntimeError):
+        await cache.async_get("molndal", failing)
+    assert (await cache.async_get("molndal", ok))["districts"][0]["id"] == 1
+
+
+@pytest.mark.asyncio
+async def test_coordinators_share_districts_download(hass: HomeAssistant) -> None:
+    districts = {
+        "districts": [
+            {
+                "id": 1,
+                "districts_exception_days": [
+                    {
+                        "name": "Studiedag",
+                        "start": "2025-10-01T00:00:00.000Z",
+                        "end": "2025-10-01T00:00:00.000Z",
+                    }
+                ],
+            }
+        ]
+    }
+    coords = [
+        MateoMealsCoordinator(
+            hass, MateoConfig(slug="molndal", school_id=i, school_name="S", municipality_name="M")
+        )
+        for i in range(3)
+    ]
+    districts_calls = 0
+
+    async def fake_fetch(url: str) -> Any:
+        nonlocal districts_calls
+        if url.endswith("districts.json"):
+            districts_calls += 1
+            await asyncio.sleep(0.01)
+            return districts
+        return []
+
+    patches = [
+        patch.object(c.municipality, "_async_fetch_json", side_effect=fake_fetch) for c in coords
+    ]
+    for p in patches:
+        p.start()
+    try:
+        results = await asyncio.gather(*(c._async_update_data() for c in coords))
+    finally:
+        for p in patches:
+            p.stop()
+
+    assert districts_calls == 1
+    # Exception days are per school: only district 1 has one.
+    assert [len(r["exception_days"]) for r in results] == [0, 1, 0]
+    assert date(2025, 10, 1) in results[1]["exception_days"]
+    # Shared payload is left untouched
+    assert districts["districts"][0]["districts_exception_days"][0]["start"].endswith("Z")
+    assert async_get_districts_cache(hass) is async_get_districts_cache(hass)
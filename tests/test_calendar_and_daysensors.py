@@ -149,3 +149,34 @@ async def test_calendar_serving_window_times(hass: HomeAssistant) -> None:
     event = events[0]
     assert event.start.hour == 9 and event.start.minute == 30
     assert event.end.hour == 11 and event.end.minute == 15
+
+
+@pytest.mark.asyncio
+async def test_calendar_event_index_reused_until_data_changes(hass: HomeAssistant) -> None:
+    cfg = MateoConfig(
+        slug="molndal", school_id=13, school_name="School", municipality_name="Mölndal"
+    )
+    coord = MateoMealsCoordinator(hass, cfg)
+    base = datetime(2025, 9, 15, tzinfo=UTC).date()  # Monday
+    meals_by_date = {(base + timedelta(days=o)).isoformat(): [f"Meal {o}"] for o in range(5)}
+    coord.async_set_updated_data({"meals_by_date": meals_by_date})
+    cal = MateoMealsCalendarEntity(
+        coordinator=coord,
+        cfg=cfg,
+        entry_id="entry",
+        serving_start="10:00",
+        serving_end="12:00",
+        days_ahead=5,
+        include_weekends=False,
+    )
+    start = datetime.combine(base + timedelta(days=1), datetime.min.time(), UTC)
+    events = await cal.async_get_events(hass, start, start + timedelta(days=2))
+    assert [e.summary for e in events] == ["Meal 1", "Meal 2"]
+    index = cal._event_index()
+    await cal.async_get_events(hass, start, start + timedelta(days=1))
+    assert cal._event_index() is index
+
+    coord.async_set_updated_data({"meals_by_date": {base.isoformat(): ["Ny meny"]}})
+    events = await cal.async_get_events(hass, start - timedelta(days=1), start)
+    assert [e.summary for e in events] == ["Ny meny"]
+    assert cal._event_index() is not index
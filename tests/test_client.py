@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.mateo_meals.client import (
+    MateoClient,
+    MateoConnectionError,
+    MateoNotFoundError,
+    MateoResponseError,
+)
+
+URL = "https://objects.dc-fbg1.glesys.net/mateo.molndal/menus/app/13_38.json"
+
+
+@pytest.mark.asyncio
+async def test_client_retries_server_errors(hass: HomeAssistant, aioclient_mock: Any) -> None:
+    session = aioclient_mock.create_session(hass.loop)
+    client = MateoClient(session, retries=2, backoff=0)
+    aioclient_mock.get(URL, status=503)
+    try:
+        with pytest.raises(MateoResponseError) as excinfo:
+            await client.async_get_json(URL)
+    finally:
+        await session.close()
+    assert excinfo.value.status == 503
+    assert aioclient_mock.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_client_does_not_retry_not_found(hass: HomeAssistant, aioclient_mock: Any) -> None:
+    session = aioclient_mock.create_session(hass.loop)
+    client = MateoClient(session, retries=2, backoff=0)
+    aioclient_mock.get(URL, status=404)
+    try:
+        with pytest.raises(MateoNotFoundError):
+            await client.async_get_json(URL)
+    finally:
+        await session.close()
+    assert aioclient_mock.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_client_wraps_timeouts(hass: HomeAssistant, aioclient_mock: Any) -> None:
+    session = aioclient_mock.create_session(hass.loop)
+    client = MateoClient(session, retries=1, backoff=0)
+    aioclient_mock.get(URL, exc=TimeoutError())
+    try:
+        with pytest.raises(MateoConnectionError):
+            await client.async_get_json(URL)
+    finally:
+        await session.close()
+    assert aioclient_mock.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_client_typed_methods_and_week_stream(
+    hass: HomeAssistant, aioclient_mock: Any
+) -> None:
+    base = "https://objects.dc-fbg1.glesys.net"
+    aioclient_mock.get(
+        f"{base}/mateo.shared/mateo-menu/municipalities.json",
+        json=[{"name": "R", "municipalities": [{"slug": "molndal", "name": "Mölndal"}] * 2}],
+    )
+    aioclient_mock.get(
+        f"{base}/mateo.molndal/menus/app/districts.json",
+        json={
+            "districts": [
+                {
+                    "id": 13,
+                    "name": "Skolan",
+                    "districts_exception_days": [
+                        {
+                            "name": "Lov",
+                            "start": "2025-10-27T00:00:00.000Z",
+                            "end": "2025-10-31T00:00:00.000Z",
+                        }
+                    ],
+                }
+            ]
+        },
+    )
+    aioclient_mock.get(
+        f"{base}/mateo.molndal/menus/app/13_38.json",
+        json=[{"date": "2025-09-15T00:00:00.000Z", "meals": [{"name": " Soppa "}]}],
+    )
+    aioclient_mock.get(f"{base}/mateo.molndal/menus/app/13_39.json", status=404)
+    aioclient_mock.get(f"{base}/mateo.molndal/menus/app/13_2025-W39.json", status=404)
+    session = aioclient_mock.create_session(hass.loop)
+    client = MateoClient(session, retries=0)
+    try:
+        municipalities = await client.async_get_municipalities()
+        districts = await client.async_get_districts("molndal")
+        weeks = [
+            w
+            async for w in client.async_iter_week_menus(
+                "molndal", 13, date(2025, 9, 16), date(2025, 9, 26)
+            )
+        ]
+    finally:
+        await session.close()
+
+    assert [(m.slug, m.name) for m in municipalities] == [("molndal", "Mölndal")]
+    assert districts[0].id == 13
+    assert districts[0].exception_days[0]["start"] == "2025-10-27"
+    assert [w.monday for w in weeks] == [date(2025, 9, 15)]
+    assert weeks[0].meals_by_date == {"2025-09-15": ["Soppa"]}
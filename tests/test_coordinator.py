@@ -27,9 +27,322 @@ async def test_coordinator_parses_weeks(hass: HomeAssistant) -> None:
             {"date": "2025-09-15T00:00:00.000Z", "meals": [{"name": "Korv stroganoff"}]}
         ]
 
-    with patch.object(coord, "_async_fetch_json", side_effect=fake_fetch):
+    with patch.object(coord.municipality, "_async_fetch_json", side_effect=fake_fetch):
         data = await coord._async_update_data()
 
     # meals_by_date should contain normalized names
     assert data["meals_by_date"]["2025-09-15"][0] == "Korv stroganoff"
     assert isinstance(data["today_meals"], list)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_fetches_concurrently(hass: HomeAssistant) -> None:
+    import asyncio
+
+    cfg = MateoConfig(
+        slug="molndal", school_id=13, school_name="School", municipality_name="Mölndal"
+    )
+    coord = MateoMealsCoordinator(hass, cfg)
+    in_flight = 0
+    peak = 0
+
+    async def slow_fetch(url: str) -> Any:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if url.endswith("districts.json"):
+            return {"districts": []}
+        return []
+
+    with patch.object(coord.municipality, "_async_fetch_json", side_effect=slow_fetch):
+        await coord._async_update_data()
+
+    # Both weeks and districts were in flight at the same time
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_coordinator_legacy_fallback(hass: HomeAssistant) -> None:
+    cfg = MateoConfig(
+        slug="molndal", school_id=13, school_name="School", municipality_name="Mölndal"
+    )
+    coord = MateoMealsCoordinator(hass, cfg)
+    requested: list[str] = []
+
+    async def fake_fetch(url: str) -> Any:
+        requested.append(url)
+        if url.endswith("districts.json"):
+            return {"districts": []}
+        if "-W" not in url:
+            raise RuntimeError("404")
+        return [{"date": "2025-09-16T00:00:00.000Z", "meals": [{"name": "Fisk"}]}]
+
+    with patch.object(coord.municipality, "_async_fetch_json", side_effect=fake_fetch):
+        data = await coord._async_update_data()
+
+    assert data["meals_by_date"]["2025-09-16"] == ["Fisk"]
+    assert sum("-W" in u for u in requested) == 2
+
+
+@pytest.mark.asyncio
+async def test_coordinator_warm_starts_from_snapshot(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    from custom_components.mateo_meals.coordinator import _local_today, snapshot_storage_key
+
+    cfg = MateoConfig(
+        slug="molndal", school_id=13, school_name="School", municipality_name="Mölndal"
+    )
+    coord = MateoMealsCoordinator(hass, cfg)
+    assert await coord.async_load_snapshot() is False
+
+    async def fake_fetch(url: str) -> Any:
+        if url.endswith("districts.json"):
+            return {"districts": []}
+        return [{"date": "2025-09-15T00:00:00.000Z", "meals": [{"name": "Pannkakor"}]}]
+
+    with patch.object(coord.municipality, "_async_fetch_json", side_effect=fake_fetch):
+        data = await coord._async_update_data()
+    # Flush the delayed save and restore into a fresh coordinator without touching the network
+    await coord._snapshot.async_save({"meals_by_date": data["meals_by_date"], "exception_days": []})
+    stored = hass_storage[snapshot_storage_key("molndal", 13)]["data"]
+    assert "2025-09-15" in stored["meals_by_date"]
+
+    restored = MateoMealsCoordinator(hass, cfg)
+    with patch.object(
+        restored.municipality, "_async_fetch_json", side_effect=AssertionError("no network")
+    ):
+        assert await restored.async_load_snapshot() is True
+    assert restored.data["meals_by_date"]["2025-09-15"] == ["Pannkakor"]
+    assert restored.data["today_date"] == _local_today().isoformat()
+
+
+@pytest.mark.asyncio
+async def test_municipality_batches_schools(hass: HomeAssistant) -> None:
+    from custom_components.mateo_meals.coordinator import async_get_municipality_coordinator
+
+    municipality = async_get_municipality_coordinator(hass, "molndal")
+    assert async_get_municipality_coordinator(hass, "molndal") is municipality
+    views = [
+        MateoMealsCoordinator(
+            hass,
+            MateoConfig(slug="molndal", school_id=sid, school_name="S", municipality_name="M"),
+            municipality=municipality,
+        )
+        for sid in (1, 2, 3)
+    ]
+    requested: list[str] = []
+
+    async def fake_fetch(url: str) -> Any:
+        requested.append(url)
+        if url.endswith("districts.json"):
+            return {"districts": []}
+        school = url.rsplit("/", 1)[1].split("_", 1)[0]
+        return [{"date": "2025-09-15T00:00:00.000Z", "meals": [{"name": f"Meal {school}"}]}]
+
+    removers = [view.async_add_listener(lambda: None) for view in views]
+    try:
+        with patch.object(municipality, "_async_fetch_json", side_effect=fake_fetch):
+            await municipality.async_refresh()
+    finally:
+        for remove in removers:
+            remove()
+
+    assert sum(u.endswith("districts.json") for u in requested) == 1
+    assert len(requested) == 1 + 2 * len(views)
+    assert [v.data["meals_by_date"]["2025-09-15"] for v in views] == [
+        ["Meal 1"],
+        ["Meal 2"],
+        ["Meal 3"],
+    ]
+    for view in views:
+        view.async_detach()
+    assert not municipality.has_views
+
+
+@pytest.mark.asyncio
+async def test_failing_school_keeps_previous_slice(hass: HomeAssistant) -> None:
+    from custom_components.mateo_meals.coordinator import async_get_municipality_coordinator
+
+    municipality = async_get_municipality_coordinator(hass, "molndal")
+    views = [
+        MateoMealsCoordinator(
+            hass,
+            MateoConfig(slug="molndal", school_id=sid, school_name="S", municipality_name="M"),
+            municipality=municipality,
+        )
+        for sid in (1, 2)
+    ]
+    failing: set[str] = set()
+    round_no = 0
+
+    async def fake_fetch(url: str) -> Any:
+        if url.endswith("districts.json"):
+            return {"districts": []}
+        school = url.rsplit("/", 1)[1].split("_", 1)[0]
+        if school in failing:
+            raise TimeoutError
+        name = f"Meal {school}.{round_no}"
+        return [{"date": "2025-09-15T00:00:00.000Z", "meals": [{"name": name}]}]
+
+    removers = [view.async_add_listener(lambda: None) for view in views]
+    try:
+        with patch.object(municipality, "_async_fetch_json", side_effect=fake_fetch):
+            await municipality.async_refresh()
+            first = views[1].data
+            round_no, failing = 1, {"2"}
+            await municipality.async_refresh()
+    finally:
+        for remove in removers:
+            remove()
+
+    assert municipality.last_update_success
+    assert views[0].data["meals_by_date"]["2025-09-15"] == ["Meal 1.1"]
+    # School 2 failed this round; its view keeps the last good slice and stays available.
+    assert municipality.data[2] is first
+    assert views[1].data is first
+    assert views[1].last_update_success
+    assert views[1].metrics.consecutive_failures == 1
+    for view in views:
+        view.async_detach()
+
+
+@pytest.mark.asyncio
+async def test_midnight_rollover_uses_cached_menu(hass: HomeAssistant) -> None:
+    from datetime import date, datetime
+
+    cfg = MateoConfig(
+        slug="molndal", school_id=13, school_name="School", municipality_name="Mölndal"
+    )
+    coord = MateoMealsCoordinator(hass, cfg)
+    coord.async_set_updated_data(
+        {
+            "today_date": "2025-09-15",
+            "today_meals": ["Måndag"],
+            "meals_by_date": {"2025-09-15": ["Måndag"], "2025-09-16": ["Tisdag"]},
+            "exception_days": [],
+        }
+    )
+    assert coord.day_slot(0, False).state == "Måndag"
+
+    with patch.object(
+        coord.municipality, "_async_fetch_json", side_effect=AssertionError("no network")
+    ):
+        coord.municipality._async_handle_rollover(datetime(2025, 9, 16, 0, 0))
+
+    assert coord.data["today_date"] == "2025-09-16"
+    assert coord.data["today_meals"] == ["Tisdag"]
+    assert coord.day_slot(0, False).date == date(2025, 9, 16)
+    assert coord.day_slot(0, False).state == "Tisdag"
+
+
+@pytest.mark.asyncio
+async def test_horizon_weeks_fetched_and_unchanged_weeks_not_reparsed(hass: HomeAssistant) -> None:
+    from custom_components.mateo_meals import coordinator as coordinator_module
+
+    cfg = MateoConfig(
+        slug="molndal", school_id=13, school_name="School", municipality_name="Mölndal"
+    )
+    coord = MateoMealsCoordinator(hass, cfg, horizon_weeks=4)
+    payloads: dict[str, Any] = {}
+    requested: list[str] = []
+
+    async def fake_fetch(url: str) -> Any:
+        requested.append(url)
+        if url.endswith("districts.json"):
+            return {"districts": []}
+        # Same object on every call, like a 304 served from the validator store
+        return payloads.setdefault(
+            url, [{"date": "2025-09-15T00:00:00.000Z", "meals": [{"name": "Soppa"}]}]
+        )
+
+    parse = coordinator_module.parse_week_meals
+    with (
+        patch.object(coord.municipality, "_async_fetch_json", side_effect=fake_fetch),
+        patch.object(coordinator_module, "parse_week_meals", side_effect=parse) as parsed,
+    ):
+        await coord._async_update_data()
+        assert sum(not u.endswith("districts.json") for u in requested) == 4
+        assert parsed.call_count == 4
+        await coord._async_update_data()
+        assert parsed.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_missing_weeks_are_negatively_cached(hass: HomeAssistant) -> None:
+    from custom_components.mateo_meals.coordinator import MenuNotFound
+
+    cfg = MateoConfig(
+        slug="molndal", school_id=13, school_name="School", municipality_name="Mölndal"
+    )
+    coord = MateoMealsCoordinator(hass, cfg)
+    municipality = coord.municipality
+    requested: list[str] = []
+
+    async def summer_break(url: str) -> Any:
+        requested.append(url)
+        if url.endswith("districts.json"):
+            return {"districts": []}
+        raise MenuNotFound(f"HTTP 404 for {url}")
+
+    with patch.object(municipality, "_async_fetch_json", side_effect=summer_break):
+        data = await coord._async_update_data()
+        # Both weeks missing is not an error: entities stay available with no menu
+        assert data["meals_by_date"] == {}
+        assert sum(not u.endswith("districts.json") for u in requested) == 4
+        requested.clear()
+        await coord._async_update_data()
+        assert not [u for u in requested if not u.endswith("districts.json")]
+
+        misses = sorted(m.misses for m in municipality._missing_weeks.values())
+        assert misses == [1, 1]
+        # Manual refresh clears the negative cache
+        municipality.async_forget_missing_weeks(13)
+        await coord._async_update_data()
+        assert sum(not u.endswith("districts.json") for u in requested) == 4
+
+
+@pytest.mark.asyncio
+async def test_detected_url_scheme_is_requested_directly(hass: HomeAssistant) -> None:
+    from custom_components.mateo_meals.client import SCHEME_ISO_WEEK
+    from custom_components.mateo_meals.schemes import async_get_url_schemes
+
+    cfg = MateoConfig(
+        slug="molndal", school_id=13, school_name="School", municipality_name="Mölndal"
+    )
+    coord = MateoMealsCoordinator(hass, cfg)
+    requested: list[str] = []
+
+    async def iso_only(url: str) -> Any:
+        requested.append(url)
+        if url.endswith("districts.json"):
+            return {"districts": []}
+        if "-W" not in url:
+            raise RuntimeError("404")
+        return [{"date": "2025-09-16T00:00:00.000Z", "meals": [{"name": "Fisk"}]}]
+
+    with patch.object(coord.municipality, "_async_fetch_json", side_effect=iso_only):
+        await coord._async_update_data()
+        assert (await async_get_url_schemes(hass)).order("molndal")[0] == SCHEME_ISO_WEEK
+        requested.clear()
+        data = await coord._async_update_data()
+
+    weeks = [u for u in requested if not u.endswith("districts.json")]
+    assert len(weeks) == 2
+    assert all("-W" in u for u in weeks)
+    assert data["meals_by_date"]["2025-09-16"] == ["Fisk"]
+
+
+@pytest.mark.asyncio
+async def test_horizon_covers_days_ahead(hass: HomeAssistant) -> None:
+    from custom_components.mateo_meals.coordinator import min_horizon_weeks
+
+    # From a Saturday, 5 school days need next week, 14 need three more weeks.
+    assert [min_horizon_weeks(d) for d in (1, 5, 6, 10, 14)] == [2, 2, 3, 3, 4]
+    cfg = MateoConfig(
+        slug="molndal", school_id=13, school_name="School", municipality_name="Mölndal"
+    )
+    assert MateoMealsCoordinator(hass, cfg, horizon_weeks=2, days_ahead=14).horizon_weeks == 4
+    assert MateoMealsCoordinator(hass, cfg, horizon_weeks=5, days_ahead=5).horizon_weeks == 5
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mateo_meals import COORDINATORS
+from custom_components.mateo_meals.coordinator import (
+    MateoConfig,
+    MateoMealsCoordinator,
+    async_get_municipality_coordinator,
+)
+from custom_components.mateo_meals.diagnostics import async_get_config_entry_diagnostics
+from custom_components.mateo_meals.metrics import FetchMetrics, Histogram
+
+BASE = "https://objects.dc-fbg1.glesys.net/mateo.molndal/menus/app"
+WEEK = [{"date": "2025-09-15T00:00:00.000Z", "meals": [{"name": "Köttbullar"}]}]
+
+
+def _mock_server(aioclient_mock: Any, *, revalidate: bool) -> None:
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(
+        f"{BASE}/districts.json", json={"districts": [{"id": 13, "name": "S"}]}
+    )
+    if revalidate:
+        aioclient_mock.get(f"{BASE}/13_38.json", status=304)
+    else:
+        aioclient_mock.get(f"{BASE}/13_38.json", json=WEEK, headers={"ETag": '"w38"'})
+    aioclient_mock.get(f"{BASE}/13_39.json", status=404)
+    aioclient_mock.get(f"{BASE}/13_2025-W39.json", status=404)
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_report_fetch_counters(
+    hass: HomeAssistant, aioclient_mock: Any
+) -> None:
+    cfg = MateoConfig(slug="molndal", school_id=13, school_name="S", municipality_name="Mölndal")
+    # Registered like a loaded entry's, so it is listed under "municipalities" too.
+    shared = async_get_municipality_coordinator(hass, "molndal")
+    coord = MateoMealsCoordinator(hass, cfg, municipality=shared)
+    entry = MockConfigEntry(domain="mateo_meals", data={"slug": "molndal", "school_id": 13})
+    session = aioclient_mock.create_session(hass.loop)
+    COORDINATORS[entry.entry_id] = coord
+    try:
+        with (
+            patch(
+                "custom_components.mateo_meals.api._async_create_session", return_value=session
+            ),
+            patch(
+                "custom_components.mateo_meals.coordinator._local_today",
+                return_value=date(2025, 9, 15),
+            ),
+        ):
+            _mock_server(aioclient_mock, revalidate=False)
+            await coord.municipality.async_refresh()
+            # Second round: 304 for week 38, districts from the TTL cache, week 39 backed off.
+            _mock_server(aioclient_mock, revalidate=True)
+            await coord.municipality.async_refresh()
+        diag = await async_get_config_entry_diagnostics(hass, entry)
+    finally:
+        COORDINATORS.clear()
+
+    assert diag["municipalities"]["molndal"]["requests"] == 5
+    assert diag["municipalities"]["molndal"]["schools"] == [13]
+
+    municipality = diag["municipality"]
+    assert municipality["requests"] == 5
+    assert municipality["statuses"] == {"200": 2, "404": 2, "304": 1}
+    assert municipality["scheme_fallbacks"] == 1
+    assert municipality["legacy_scheme_weeks"] == 0
+    caches = municipality["caches"]
+    assert caches["not_modified"]["hits"] == 1
+    assert caches["districts"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+    assert caches["parsed_weeks"]["hits"] == 1
+    assert caches["missing_weeks"]["hits"] == 1
+    assert municipality["week_parse"]["count"] == 1
+    assert municipality["json_decode"]["count"] == 2
+    assert municipality["update"]["duration"]["count"] == 2
+    week_38 = municipality["urls"][f"{BASE}/13_38.json"]
+    assert week_38["latency_ms"]["count"] == 2
+    assert week_38["statuses"] == {"200": 1, "304": 1}
+
+    school = diag["school"]
+    assert school["payload_bytes"] == week_38["last_size"] > 0
+    assert school["refresh"]["duration"]["count"] == 2
+    assert school["refresh"]["consecutive_failures"] == 0
+
+
+def test_histogram_buckets_and_url_eviction() -> None:
+    histogram = Histogram(bounds=(10, 100))
+    for value in (5, 10, 50, 1000):
+        histogram.observe(value)
+    assert histogram.as_dict()["buckets"] == {"le_10": 2, "le_100": 1, "inf": 1}
+    assert histogram.as_dict()["max"] == 1000
+
+    metrics = FetchMetrics()
+    with patch("custom_components.mateo_meals.metrics.METRICS_MAX_URLS", 2):
+        for url in ("a", "b", "a", "c"):
+            metrics.request_finished(url, 200, 0.01, 10, 0.001)
+    # "b" was the least recently requested URL.
+    assert list(metrics.urls) == ["a", "c"]
+    assert metrics.bytes_received == 40
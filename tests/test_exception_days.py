@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.mateo_meals.cache import async_get_districts_cache
+from custom_components.mateo_meals.calendar import MateoMealsCalendarEntity
+from custom_components.mateo_meals.coordinator import MateoConfig, MateoMealsCoordinator
+from custom_components.mateo_meals.exception_days import ExceptionDayIndex
+
+
+def test_index_merges_and_looks_up_intervals() -> None:
+    index = ExceptionDayIndex.from_days(
+        [
+            {"name": "Höstlov", "start": "2025-10-27", "end": "2025-10-31"},
+            {"name": "Studiedag", "start": "2025-10-26", "end": "2025-10-26"},
+            {"name": "Jullov", "start": "2025-12-22", "end": "2026-01-06"},
+            {"name": "Trasig", "start": "not a date"},
+        ]
+    )
+    assert len(index) == 3
+    assert index.starts == (date(2025, 10, 26), date(2025, 12, 22))
+    assert date(2025, 10, 26) in index and date(2025, 10, 31) in index
+    assert date(2025, 10, 25) not in index
+    assert date(2025, 11, 3) not in index
+    assert date(2026, 1, 1) in index
+    assert index.name_at(date(2025, 10, 28)) == "Studiedag; Höstlov"
+    assert index.name_at(date(2025, 12, 1)) is None
+    assert ExceptionDayIndex.from_days(index.as_list()) == index
+
+
+def _exception_day(name: str, day: str) -> dict[str, str]:
+    return {"name": name, "start": f"{day}T00:00:00.000Z", "end": f"{day}T00:00:00.000Z"}
+
+
+@pytest.mark.asyncio
+async def test_exception_days_are_filtered_to_the_school(hass: HomeAssistant) -> None:
+    cfg = MateoConfig(slug="molndal", school_id=13, school_name="School", municipality_name="M")
+    coord = MateoMealsCoordinator(hass, cfg)
+    districts = {
+        "districts": [
+            {"id": 13, "districts_exception_days": [_exception_day("Studiedag", "2025-09-16")]},
+            {"id": 14, "districts_exception_days": [_exception_day("Annan skola", "2025-09-17")]},
+        ]
+    }
+
+    async def fake_fetch(url: str) -> Any:
+        if url.endswith("districts.json"):
+            return districts
+        return [
+            {"date": f"2025-09-{d}T00:00:00.000Z", "meals": [{"name": f"Lunch {d}"}]}
+            for d in (15, 16, 17)
+        ]
+
+    with patch.object(coord.municipality, "_async_fetch_json", side_effect=fake_fetch):
+        data = await coord._async_update_data()
+    exception_days = data["exception_days"]
+    assert len(exception_days) == 1
+    assert date(2025, 9, 16) in exception_days and date(2025, 9, 17) not in exception_days
+
+    coord.async_set_updated_data({**data, "today_date": "2025-09-15"})
+    # The study day is not a school day, so tomorrow's sensor shows the day after.
+    assert coord.day_slot(1, False).date == date(2025, 9, 17)
+
+    cal = MateoMealsCalendarEntity(
+        coordinator=coord,
+        cfg=cfg,
+        entry_id="entry",
+        serving_start="11:00",
+        serving_end="12:00",
+        days_ahead=5,
+        include_weekends=False,
+    )
+    events = await cal.async_get_events(
+        hass, datetime(2025, 9, 15, tzinfo=UTC), datetime(2025, 9, 18, tzinfo=UTC)
+    )
+    assert [ev.summary for ev in events] == ["Lunch 15", "Lunch 17"]
+
+    # An unreachable districts file keeps the last known exception days.
+    async def failing_districts(url: str) -> Any:
+        if url.endswith("districts.json"):
+            raise TimeoutError
+        return await fake_fetch(url)
+
+    async_get_districts_cache(hass).invalidate()
+    with patch.object(coord.municipality, "_async_fetch_json", side_effect=failing_districts):
+        data = await coord._async_update_data()
+    assert date(2025, 9, 16) in data["exception_days"]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.mateo_meals import COORDINATORS, async_setup
+from custom_components.mateo_meals.archive import MenuArchive, async_get_menu_archive
+from custom_components.mateo_meals.coordinator import MateoConfig, MateoMealsCoordinator
+
+DOMAIN = "mateo_meals"
+
+
+def _meal(name: str, meal_type: str, allergens: list[str]) -> dict[str, Any]:
+    return {
+        "name": name,
+        "type": meal_type,
+        "categories": [{"name": "Kött", "icon": "meat"}],
+        "allergens": [{"name": allergen} for allergen in allergens],
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_menu_merges_archive_and_filters(hass: HomeAssistant, tmp_path) -> None:
+    hass.data.setdefault(DOMAIN, {})["archive"] = MenuArchive(hass, str(tmp_path / "a.db"))
+    archive = async_get_menu_archive(hass)
+    await archive.async_store(
+        "molndal",
+        {
+            13: {
+                # Archived before meal details were kept: names only.
+                "2025-09-11": ["Fiskgratäng"],
+                "2025-09-12": [
+                    {
+                        "name": "Vegetarisk lasagne",
+                        "type": "Vegetariskt",
+                        "categories": [],
+                        "allergens": ["Mjölk"],
+                    }
+                ],
+            }
+        },
+    )
+    cfg = MateoConfig(slug="molndal", school_id=13, school_name="School", municipality_name="M")
+    coord = MateoMealsCoordinator(hass, cfg)
+    week = [
+        {
+            "date": "2025-09-15T00:00:00.000Z",
+            "meals": [
+                _meal("Korv stroganoff", "Lunch 1", ["Mjölk"]),
+                _meal("Vegetarisk korv", "Vegetariskt", []),
+            ],
+        },
+        {"date": "2025-09-16T00:00:00.000Z", "meals": [_meal("Fisk", "Lunch 1", ["Fisk"])]},
+        {"date": "2025-09-25T00:00:00.000Z", "meals": [_meal("Utanför", "Lunch 1", [])]},
+    ]
+    meals_by_date = coord.municipality._parse_week(13, date(2025, 9, 15), week)
+    coord.async_set_updated_data(
+        {
+            "today_date": "2025-09-15",
+            "today_meals": meals_by_date["2025-09-15"],
+            "meals_by_date": meals_by_date,
+        }
+    )
+    COORDINATORS["entry"] = coord
+    try:
+        await async_setup(hass, {})
+        default = await hass.services.async_call(
+            DOMAIN, "get_menu", {"entry_id": "entry"}, blocking=True, return_response=True
+        )
+        vegetarian = await hass.services.async_call(
+            DOMAIN,
+            "get_menu",
+            {
+                "entry_id": "entry",
+                "start_date": "2025-09-01",
+                "end_date": "2025-09-30",
+                "meal_types": ["VEGETAR"],
+            },
+            blocking=True,
+            return_response=True,
+        )
+        no_milk = await hass.services.async_call(
+            DOMAIN,
+            "get_menu",
+            {
+                "entry_id": "entry",
+                "start_date": "2025-09-01",
+                "end_date": "2025-09-19",
+                "exclude_allergens": ["mjölk"],
+            },
+            blocking=True,
+            return_response=True,
+        )
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN, "get_menu", {"entry_id": "missing"}, blocking=True, return_response=True
+            )
+    finally:
+        COORDINATORS.clear()
+        await archive.async_close()
+
+    # Defaults to the five days from the data's today, current weeks only.
+    assert (default["start_date"], default["end_date"]) == ("2025-09-15", "2025-09-19")
+    assert [day["date"] for day in default["days"]] == ["2025-09-15", "2025-09-16"]
+    assert default["days"][0]["meals"][0] == {
+        "name": "Korv stroganoff",
+        "type": "Lunch 1",
+        "categories": ["Kött"],
+        "allergens": ["Mjölk"],
+    }
+    assert [
+        (day["date"], [meal["name"] for meal in day["meals"]]) for day in vegetarian["days"]
+    ] == [("2025-09-12", ["Vegetarisk lasagne"]), ("2025-09-15", ["Vegetarisk korv"])]
+    # The names-only day has unknown allergens and is left out, like the meals with milk.
+    assert [
+        (day["date"], [meal["name"] for meal in day["meals"]]) for day in no_milk["days"]
+    ] == [("2025-09-15", ["Vegetarisk korv"]), ("2025-09-16", ["Fisk"])]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMockResponse
+
+from custom_components.mateo_meals.client import MateoClient
+from custom_components.mateo_meals.const import VALIDATORS_STORAGE_KEY
+from custom_components.mateo_meals.coordinator import MateoConfig, MateoMealsCoordinator
+from custom_components.mateo_meals.http_cache import ValidatorStore
+
+URL = "https://objects.dc-fbg1.glesys.net/mateo.molndal/menus/app/districts.json"
+
+
+def _coordinator(hass: HomeAssistant) -> MateoMealsCoordinator:
+    cfg = MateoConfig(
+        slug="molndal", school_id=13, school_name="School", municipality_name="Mölndal"
+    )
+    return MateoMealsCoordinator(hass, cfg)
+
+
+@pytest.mark.asyncio
+async def test_conditional_request_reuses_payload_on_304(
+    hass: HomeAssistant, aioclient_mock: Any
+) -> None:
+    coord = _coordinator(hass)
+    session = aioclient_mock.create_session(hass.loop)
+    aioclient_mock.get(URL, json={"districts": [{"id": 13}]}, headers={"ETag": '"v1"'})
+    with patch(
+        "custom_components.mateo_meals.api._async_create_session", return_value=session
+    ):
+        first = await coord.municipality._async_fetch_json(URL)
+        assert first["districts"][0]["id"] == 13
+        # First request is unconditional
+        assert not (aioclient_mock.mock_calls[0][3] or {}).get("If-None-Match")
+
+        aioclient_mock.clear_requests()
+        aioclient_mock.get(URL, status=304)
+        second = await coord.municipality._async_fetch_json(URL)
+    assert second == first
+    assert aioclient_mock.mock_calls[0][3]["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_not_modified_without_cached_payload_refetches(
+    hass: HomeAssistant, aioclient_mock: Any
+) -> None:
+    store = ValidatorStore(hass)
+    # A validator whose payload is no longer available (stored as None).
+    store.remember(URL, '"v1"', None, None)
+    responses = iter(
+        [
+            AiohttpClientMockResponse("GET", URL, status=304),
+            AiohttpClientMockResponse(
+                "GET", URL, json={"districts": [{"id": 13}]}, headers={"ETag": '"v2"'}
+            ),
+        ]
+    )
+
+    async def _respond(method: str, url: Any, data: Any) -> AiohttpClientMockResponse:
+        return next(responses)
+
+    aioclient_mock.get(URL, side_effect=_respond)
+    session = aioclient_mock.create_session(hass.loop)
+    try:
+        payload = await MateoClient(session, retries=0).async_get_json(URL, store)
+    finally:
+        await session.close()
+
+    assert payload == {"districts": [{"id": 13}]}
+    assert aioclient_mock.call_count == 2
+    assert aioclient_mock.mock_calls[0][3]["If-None-Match"] == '"v1"'
+    # The stale validator was dropped, so the second request is unconditional.
+    assert not (aioclient_mock.mock_calls[1][3] or {}).get("If-None-Match")
+    assert store.request_headers(URL) == {"If-None-Match": '"v2"'}
+
+
+@pytest.mark.asyncio
+async def test_validators_persist_across_restarts(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    store = ValidatorStore(hass)
+    await store.async_load()
+    store.remember(URL, None, "Mon, 15 Sep 2025 06:00:00 GMT", {"districts": []})
+    assert store.request_headers(URL) == {"If-Modified-Since": "Mon, 15 Sep 2025 06:00:00 GMT"}
+    # Flush the delayed save and load into a fresh instance
+    await store._store.async_save(store._data_to_save())
+    assert URL in hass_storage[VALIDATORS_STORAGE_KEY]["data"]["entries"]
+    restored = ValidatorStore(hass)
+    await restored.async_load()
+    assert restored.payload(URL) == {"districts": []}
+    assert restored.request_headers(URL)["If-Modified-Since"].startswith("Mon")
+
+
+@pytest.mark.asyncio
+async def test_responses_without_validators_are_not_kept(hass: HomeAssistant) -> None:
+    store = ValidatorStore(hass)
+    store.remember(URL, None, None, {"districts": []})
+    assert store.request_headers(URL) == {}
+    assert store.payload(URL) is None
+
+
+@pytest.mark.asyncio
+async def test_validator_store_is_capped(hass: HomeAssistant) -> None:
+    store = ValidatorStore(hass)
+    with (
+        patch("custom_components.mateo_meals.http_cache.VALIDATORS_MAX_ENTRIES", 2),
+        patch("custom_components.mateo_meals.http_cache.time") as fake_time,
+    ):
+        for i, url in enumerate(("a", "b", "c")):
+            fake_time.time.return_value = 1_000_000 + i
+            store.remember(url, f'"{url}"', None, {"n": i})
+        assert store.payload("a") is None
+        assert store.payload("b") == {"n": 1}
+        assert store.payload("c") == {"n": 2}
+        # Entries unused for longer than the maximum age are dropped as well.
+        fake_time.time.return_value = 1_000_000 + 31 * 86400
+        store.remember("d", '"d"', None, {"n": 3})
+        assert list(store._data_to_save()["entries"]) == ["d"]
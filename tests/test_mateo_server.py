@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import aiohttp
+import pytest
+from mateo_server import RECORDED_FIXTURES, MateoServer, MemoryValidators, ServerConfig
+
+from custom_components.mateo_meals.client import (
+    SCHEME_ISO_WEEK,
+    SCHEME_NUMERIC,
+    MateoClient,
+    week_url,
+)
+
+# The stand-in server listens on a real local port. The Home Assistant test plugin blocks
+# sockets in its runtest_setup and ignores the enable_socket marker; the fixture wins.
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+def _this_monday() -> date:
+    today = date.today()
+    return today - timedelta(days=today.weekday())
+
+
+@pytest.mark.asyncio
+async def test_server_scheme_mix_and_conditional_requests() -> None:
+    config = ServerConfig(municipalities=2, schools=4, iso_week_share=0.5)
+    async with MateoServer(config) as server, aiohttp.ClientSession() as session:
+        client = MateoClient(session, base_url=server.base_url, retries=0)
+        municipalities = await client.async_get_municipalities()
+        assert [m.slug for m in municipalities] == ["kommun00", "kommun01"]
+        assert server.iso_week_slugs == {"kommun00"}
+
+        monday = _this_monday()
+        iso_menu = await client.async_get_week_menu("kommun00", 1, monday)
+        numeric_menu = await client.async_get_week_menu("kommun01", 2, monday)
+        assert iso_menu is not None and iso_menu.scheme == SCHEME_ISO_WEEK
+        assert numeric_menu is not None and numeric_menu.scheme == SCHEME_NUMERIC
+        assert len(numeric_menu.meals_by_date) == 5
+        # The ISO-week municipality answered the numeric URL with a 404 first.
+        assert server.stats.by_status[404] == 1
+
+        validators = MemoryValidators()
+        url = week_url("kommun01", 2, monday, SCHEME_NUMERIC, server.base_url)
+        first = await client.async_get_json(url, validators)
+        second = await client.async_get_json(url, validators)
+        assert second == first
+        assert server.stats.by_status[304] == 1
+
+
+@pytest.mark.asyncio
+async def test_server_injected_errors_are_retried() -> None:
+    async with MateoServer(ServerConfig(fail_first=2)) as server:
+        async with aiohttp.ClientSession() as session:
+            client = MateoClient(session, base_url=server.base_url, retries=2, backoff=0)
+            districts = await client.async_get_districts("kommun00")
+    assert [d.id for d in districts] == [1, 4, 7, 10]
+    # Two 503s, then the third attempt succeeds.
+    assert server.stats.by_status == {503: 2, 200: 1}
+    assert server.stats.by_kind["districts"] == 3
+
+
+@pytest.mark.asyncio
+async def test_server_serves_recorded_fixtures() -> None:
+    async with MateoServer(ServerConfig(recorded=RECORDED_FIXTURES)) as server:
+        async with aiohttp.ClientSession() as session:
+            client = MateoClient(session, base_url=server.base_url, retries=0)
+            menu = await client.async_get_week_menu(
+                "molndal", 13, date(2025, 9, 15), schemes=(SCHEME_NUMERIC,)
+            )
+            districts = await client.async_get_districts("molndal")
+    assert menu is not None
+    assert menu.meals_by_date["2025-09-15"][0] == "Köttbullar med potatismos"
+    assert districts[0].exception_days[0]["start"] == "2025-10-27"
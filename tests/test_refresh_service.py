@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.mateo_meals import COORDINATORS, async_setup
+from custom_components.mateo_meals.coordinator import (
+    MateoConfig,
+    MateoMealsCoordinator,
+    async_get_municipality_coordinator,
+)
+
+DOMAIN = "mateo_meals"
+
+
+@pytest.mark.asyncio
+async def test_refresh_service_concurrent_and_deduplicated(hass: HomeAssistant) -> None:
+    municipality = async_get_municipality_coordinator(hass, "molndal")
+    school_ids = {"a": 1, "b": 1, "c": 2, "d": 3}
+    for entry_id, sid in school_ids.items():
+        COORDINATORS[entry_id] = MateoMealsCoordinator(
+            hass,
+            MateoConfig(slug="molndal", school_id=sid, school_name="S", municipality_name="M"),
+            municipality=municipality,
+        )
+    calls: list[int] = []
+    in_flight = 0
+    peak = 0
+
+    async def fake_fetch_school(school_id: int) -> dict[str, Any]:
+        nonlocal in_flight, peak
+        calls.append(school_id)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if school_id == 3:
+            raise RuntimeError("boom")
+        return {
+            "today_date": "2025-09-15",
+            "today_meals": [],
+            "meals_by_date": {},
+            "exception_days": [],
+        }
+
+    try:
+        await async_setup(hass, {})
+        with patch.object(municipality, "async_fetch_school", side_effect=fake_fetch_school):
+            response = await hass.services.async_call(
+                DOMAIN, "refresh", {"max_parallel": 2}, blocking=True, return_response=True
+            )
+    finally:
+        COORDINATORS.clear()
+
+    assert sorted(calls) == [1, 2, 3]
+    assert peak == 2
+    assert response["refreshed"] == 3
+    entries = response["entries"]
+    assert entries["a"]["success"] and entries["b"]["success"]
+    assert entries["a"]["deduplicated"] is False
+    assert entries["b"]["deduplicated"] is True
+    assert entries["d"]["success"] is False
+    assert "boom" in entries["d"]["error"]
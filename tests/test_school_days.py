@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from custom_components.mateo_meals.exception_days import EMPTY_EXCEPTION_DAYS, ExceptionDayIndex
+from custom_components.mateo_meals.school_days import SchoolDays
+
+MONDAY = date(2025, 9, 15)
+
+
+def _menus(*days: date) -> dict[str, list[str]]:
+    return {d.isoformat(): [f"Lunch {d.isoformat()}"] for d in days}
+
+
+def test_offsets_skip_weekends_exception_days_and_empty_weekdays() -> None:
+    week1 = [MONDAY + timedelta(days=i) for i in range(5)]
+    week2 = [MONDAY + timedelta(days=7 + i) for i in range(5)]
+    # Wednesday of week 1 has no menu (holiday), Tuesday of week 2 is a study day.
+    menus = _menus(*(d for d in week1 + week2 if d != week1[2]))
+    exception_days = ExceptionDayIndex.from_days(
+        [{"name": "Studiedag", "start": week2[1].isoformat(), "end": week2[1].isoformat()}]
+    )
+    school_days = SchoolDays.build(MONDAY, menus, exception_days, False, 10)
+
+    expected = [week1[0], week1[1], week1[3], week1[4], week2[0], *week2[2:]]
+    assert list(school_days.dates[: len(expected)]) == expected
+    # After the last published menu only weekends are skipped.
+    assert school_days.dates[len(expected)] == MONDAY + timedelta(days=14)
+    for offset, day in enumerate(school_days.dates):
+        assert school_days.date_at(offset) == day
+        assert school_days.offset_of(day) == offset
+    assert school_days.offset_of(week1[2]) is None
+    assert not school_days.is_school_day(week2[1])
+    assert not school_days.is_school_day(MONDAY - timedelta(days=2))  # Saturday before start
+
+
+def test_weekends_included_and_no_menus() -> None:
+    school_days = SchoolDays.build(MONDAY, {}, EMPTY_EXCEPTION_DAYS, True, 14)
+    assert school_days.dates == tuple(MONDAY + timedelta(days=i) for i in range(14))
+    assert school_days.is_school_day(MONDAY + timedelta(days=40))
+
+
+def test_long_exception_falls_back_to_weekend_rule() -> None:
+    everything = ExceptionDayIndex.from_days(
+        [{"name": "Stängt", "start": "2025-01-01", "end": "2027-12-31"}]
+    )
+    school_days = SchoolDays.build(MONDAY, {}, everything, False, 5)
+    assert len(school_days.dates) == 5
+    assert all(day.weekday() < 5 for day in school_days.dates)
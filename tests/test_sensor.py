@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+from typing import Any
+from unittest.mock import patch
+
 import pytest
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
 
 from custom_components.mateo_meals.coordinator import (
     MateoConfig,
     MateoMealsCoordinator,
 )
-from custom_components.mateo_meals.sensor import MateoMealsSensor, MateoMealsFixedDaySensor
+from custom_components.mateo_meals.sensor import (
+    METRIC_SENSORS,
+    MateoMealsFixedDaySensor,
+    MateoMealsSensor,
+    MateoMetricSensor,
+)
 from datetime import date
 
 
@@ -55,7 +64,7 @@ async def test_fixed_day_weekend_skip(hass: HomeAssistant, monkeypatch) -> None:
             from datetime import datetime, time
             return datetime.combine(base, time(12,0), tz)
 
-    monkeypatch.setattr("custom_components.mateo_meals.sensor.datetime", FauxDateTime)
+    monkeypatch.setattr("custom_components.mateo_meals.coordinator.datetime", FauxDateTime)
 
     today_sensor = MateoMealsFixedDaySensor(coord, cfg, entry_id="e1", day_offset=0, include_weekends=False)
     day1_sensor = MateoMealsFixedDaySensor(coord, cfg, entry_id="e1", day_offset=1, include_weekends=False)
@@ -84,8 +93,86 @@ async def test_fixed_day_no_menu_future_weekday(hass: HomeAssistant, monkeypatch
             from datetime import datetime, time
             return datetime.combine(base, time(11,0), tz)
 
-    monkeypatch.setattr("custom_components.mateo_meals.sensor.datetime", FauxDateTime2)
+    monkeypatch.setattr("custom_components.mateo_meals.coordinator.datetime", FauxDateTime2)
 
     # day1 is Friday - no data provided -> should return 'No menu'
     day1_sensor = MateoMealsFixedDaySensor(coord, cfg, entry_id="x", day_offset=1, include_weekends=False)
     assert day1_sensor.native_value == "No menu"
+
+
+@pytest.mark.asyncio
+async def test_day_table_built_once_per_update(hass: HomeAssistant) -> None:
+    cfg = MateoConfig(slug="molndal", school_id=13, school_name="Test", municipality_name="Mölndal")
+    coord = MateoMealsCoordinator(hass, cfg)
+    coord.async_set_updated_data({"meals_by_date": {}})
+    sensors = [
+        MateoMealsFixedDaySensor(coord, cfg, entry_id="e1", day_offset=o, include_weekends=False)
+        for o in range(5)
+    ]
+    assert all(s.native_value == "No menu" for s in sensors)
+    table = coord._day_tables[False][1]
+    assert [s.extra_state_attributes["offset"] for s in sensors] == list(range(5))
+    assert coord._day_tables[False][1] is table
+    assert all(slot.date.weekday() < 5 for slot in table)
+
+    coord.async_set_updated_data({"meals_by_date": {table[2].date.isoformat(): ["Lasagne"]}})
+    assert sensors[2].native_value == "Lasagne"
+    assert sensors[2].extra_state_attributes["has_meals"] is True
+    assert coord._day_tables[False][1] is not table
+
+
+@pytest.mark.asyncio
+async def test_base_sensor_attribute_budget(hass: HomeAssistant) -> None:
+    cfg = MateoConfig(slug="molndal", school_id=13, school_name="Test", municipality_name="Mölndal")
+    coord = MateoMealsCoordinator(hass, cfg)
+    long_name = "Pasta " + "x" * 300
+    days = [f"2025-09-{15 + i}" for i in range(5)]
+    meals_by_date = {day: [f"Dag {day} " + "y" * 200, "z" * 200, "Sallad"] for day in days}
+    meals_by_date[days[0]] = [long_name, "z" * 200, "Sallad"]
+    coord.async_set_updated_data({
+        "today_date": "2025-09-15",
+        "today_meals": meals_by_date["2025-09-15"],
+        "meals_by_date": meals_by_date,
+    })
+    sensor = MateoMealsSensor(coord, cfg, entry_id="test")
+
+    assert len(sensor.native_value) <= 255
+    attrs = sensor.extra_state_attributes
+    assert attrs["today_meals"][0].endswith("…") and len(attrs["today_meals"][0]) == 100
+    # Names are clipped to 100 characters (206 per day); whole days are dropped once the
+    # 1000 character budget is spent.
+    assert list(attrs["upcoming_meals"]) == days[:3]
+    assert attrs["menu_truncated"] is True
+    assert sensor.extra_state_attributes is attrs  # built once per coordinator update
+    assert {"today_meals", "upcoming_meals"} <= sensor._unrecorded_attributes
+
+
+@pytest.mark.asyncio
+async def test_metric_sensors_follow_refresh_attempts(hass: HomeAssistant) -> None:
+    cfg = MateoConfig(slug="molndal", school_id=13, school_name="Test", municipality_name="Mölndal")
+    coord = MateoMealsCoordinator(hass, cfg)
+    sensors = {d.key: MateoMetricSensor(coord, cfg, d) for d in METRIC_SENSORS}
+    notified: list[bool] = []
+    coord.async_add_metrics_listener(lambda: notified.append(True))
+
+    def empty_weeks(url: str) -> Any:
+        return {"districts": []} if url.endswith("districts.json") else []
+
+    municipality = coord.municipality
+    with patch.object(municipality, "_async_fetch_json", side_effect=UpdateFailed("down")):
+        await municipality.async_refresh()
+        await municipality.async_refresh()
+    assert notified == [True, True]
+    assert sensors["consecutive_failures"].native_value == 2
+    assert sensors["last_success"].native_value is None
+    assert sensors["refresh_duration"].native_value is not None
+
+    # Unchanged (empty) menus notify no coordinator listener, but the metrics still update.
+    with patch.object(municipality, "_async_fetch_json", side_effect=empty_weeks):
+        await municipality.async_refresh()
+    assert len(notified) == 3
+    assert sensors["consecutive_failures"].native_value == 0
+    assert sensors["last_success"].native_value is not None
+    assert sensors["payload_size"].native_value == 0
+    assert sensors["next_refresh"].native_value is None  # nothing listens, so no timer
+    assert not any(s.entity_registry_enabled_default for s in sensors.values())
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import os
+from datetime import date, timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+from simulation import Scenario, async_run_scenario, school_year_scenario
+
+from custom_components.mateo_meals.archive import MenuArchive
+
+# The simulation serves its fixtures from a MateoServer on a real local port. The Home
+# Assistant test plugin blocks sockets in its runtest_setup and ignores the enable_socket
+# marker; the fixture wins.
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+@pytest.mark.asyncio
+async def test_simulation_across_iso_week_53_and_holidays(hass: HomeAssistant, tmp_path) -> None:
+    # 2026 has 53 ISO weeks; Christmas (W52) and the first week of 2027 are served empty.
+    scenario = Scenario(
+        name="year-boundary",
+        start=date(2026, 12, 14),
+        days=28,
+        municipalities=2,
+        entries=6,
+        update_hours=6,
+        holiday_weeks=frozenset({date(2026, 12, 21), date(2027, 1, 4)}),
+        trace_memory=False,
+    )
+    report = await async_run_scenario(hass, scenario, tmp_path)
+
+    assert report.rollovers == 27
+    assert report.refreshes == 2 * 28 * 4
+    assert report.failed_refreshes == 0
+    assert report.requests > 0 and report.bytes_transferred > 0
+    assert report.parse_calls > 0
+    assert report.loop_busy_seconds > 0
+
+    archive = MenuArchive(hass, str(tmp_path / "archive.db"))
+    try:
+        week_53 = await archive.async_range("kommun00", 1, date(2026, 12, 28), date(2027, 1, 1))
+        holiday = await archive.async_range(
+            "kommun00", 1, date(2026, 12, 21), date(2026, 12, 21) + timedelta(days=4)
+        )
+    finally:
+        await archive.async_close()
+    assert sorted(week_53) == [
+        (date(2026, 12, 28) + timedelta(days=i)).isoformat() for i in range(5)
+    ]
+    assert holiday == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(
+    not os.environ.get("MATEO_SIMULATION"), reason="set MATEO_SIMULATION=1 for the full year"
+)
+async def test_simulation_full_school_year(hass: HomeAssistant, tmp_path) -> None:
+    scenario = school_year_scenario(2026)
+    report = await async_run_scenario(hass, scenario, tmp_path)
+
+    assert report.rollovers == scenario.days - 1
+    assert report.refreshes == scenario.municipalities * scenario.days * 24 // scenario.update_hours
+    assert report.failed_refreshes == 0
+    assert report.requests_by_status.get(200, 0) > 0
+    assert report.peak_memory_bytes > 0
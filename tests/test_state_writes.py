@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.mateo_meals.coordinator import MateoConfig, MateoMealsCoordinator
+from custom_components.mateo_meals.sensor import MateoMealsFixedDaySensor, MateoMealsSensor
+
+CFG = MateoConfig(slug="molndal", school_id=13, school_name="School", municipality_name="Mölndal")
+
+
+def _data(meal: str) -> dict[str, Any]:
+    return {
+        "today_date": "2025-09-15",
+        "today_meals": [meal],
+        "meals_by_date": {"2025-09-15": [meal], "2025-09-16": ["Soppa"]},
+    }
+
+
+@pytest.mark.asyncio
+async def test_unchanged_refresh_does_not_notify_listeners(hass: HomeAssistant) -> None:
+    coord = MateoMealsCoordinator(hass, CFG)
+    updates = 0
+
+    def _listener() -> None:
+        nonlocal updates
+        updates += 1
+
+    unsub = coord.async_add_listener(_listener)
+
+    async def fake_fetch(url: str) -> Any:
+        if url.endswith("districts.json"):
+            return {"districts": []}
+        return [{"date": "2025-09-15T00:00:00.000Z", "meals": [{"name": "Korv"}]}]
+
+    try:
+        with patch.object(coord.municipality, "_async_fetch_json", side_effect=fake_fetch):
+            await coord.municipality.async_refresh()
+            first = coord.data
+            await coord.municipality.async_refresh()
+    finally:
+        unsub()
+    assert updates == 1
+    assert coord.data is first
+
+
+@pytest.mark.asyncio
+async def test_entities_write_only_changed_state(hass: HomeAssistant) -> None:
+    coord = MateoMealsCoordinator(hass, CFG)
+    coord.async_set_updated_data(_data("Korv"))
+    base = MateoMealsSensor(coord, CFG, "e1")
+    tomorrow = MateoMealsFixedDaySensor(coord, CFG, "e1", 1, include_weekends=False)
+
+    with (
+        patch.object(MateoMealsSensor, "async_write_ha_state") as base_write,
+        patch.object(MateoMealsFixedDaySensor, "async_write_ha_state") as day_write,
+    ):
+        for entity in (base, tomorrow):
+            entity._handle_coordinator_update()
+        assert (base_write.call_count, day_write.call_count) == (1, 1)
+
+        # Same content in a new object: nothing is written.
+        coord.async_set_updated_data(_data("Korv"))
+        for entity in (base, tomorrow):
+            entity._handle_coordinator_update()
+        assert (base_write.call_count, day_write.call_count) == (1, 1)
+
+        # Only today's meal changed: the base sensor writes, tomorrow's sensor does not.
+        coord.async_set_updated_data(_data("Fisk"))
+        for entity in (base, tomorrow):
+            entity._handle_coordinator_update()
+        assert (base_write.call_count, day_write.call_count) == (2, 1)